@@ -2,24 +2,67 @@
 Advanced demonstration functions for web scraping capabilities
 """
 
+from functools import lru_cache
+
 from src.handlers.http_handler import SmartHTTPHandler
 from src.handlers.dynamic_content_handler import DynamicContentHandler
 from src.handlers.anti_scraping_handler import AntiScrapingHandler
 
+
+# Demo fixtures, built once at import
+_TEST_URLS = (
+    "https://www.bbc.com/news",
+    "https://edition.cnn.com/",
+    "https://www.reuters.com/"
+)
+
+# Sample HTML content with different frameworks
+_TEST_SCENARIOS = (
+    ("React App", b'<div id="root" data-reactroot=""></div><script src="/static/js/react.js"></script>'),
+    ("Vue App", b'<div id="app"></div><script>window.Vue = {}</script>'),
+    ("Regular Site", b'<html><body><h1>Traditional Website</h1></body></html>')
+)
+
+# Simulated anti-scraping responses
+_ANTI_SCENARIOS = (
+    ("cloudflare", "Checking your browser before accessing..."),
+    ("captcha", "Please complete the CAPTCHA to continue"),
+    ("rate_limit", "Too many requests from your IP"),
+    ("clean", "Welcome to our news website")
+)
+
+
+# Handlers are created once and shared by every demo run
+@lru_cache(maxsize=1)
+def _http_handler() -> SmartHTTPHandler:
+    return SmartHTTPHandler()
+
+
+@lru_cache(maxsize=1)
+def _dynamic_handler() -> DynamicContentHandler:
+    return DynamicContentHandler()
+
+
+@lru_cache(maxsize=1)
+def _anti_scraping_handler() -> AntiScrapingHandler:
+    return AntiScrapingHandler()
+
+
 async def demonstrate_http_mastery():
     """Demonstrate HTTP protocol mastery"""
     print("\n🌐 HTTP Protocol Mastery Demonstration")
     print("="*60)
     
-    handler = SmartHTTPHandler()
+    handler = _http_handler()
     
-    test_urls = [
-        "https://www.bbc.com/news",
-        "https://edition.cnn.com/",
-        "https://www.reuters.com/"
-    ]
+    # Probe all URLs concurrently over the handler's pooled session;
+    # header generation is CPU-only
+    try:
+        healths = await handler.check_urls_health(_TEST_URLS)
+    finally:
+        await handler.close()
     
-    for url in test_urls:
+    for url, health in zip(_TEST_URLS, healths):
         print(f"\n🔍 Analyzing: {url}")
         
         # Generate smart headers
@@ -27,11 +70,14 @@ async def demonstrate_http_mastery():
         print(f"   📡 User-Agent: {headers['User-Agent'][:50]}...")
         print(f"   🔗 Referer: {headers.get('Referer', 'None')}")
         
-        # Check URL health
-        health = await handler.check_url_health(url)
+        if isinstance(health, Exception):
+            print(f"   ❌ Health check failed: {health}")
+            continue
+        
         print(f"   ✅ Accessible: {health.get('accessible', False)}")
         print(f"   ⚡ Latency: {health.get('latency', 0):.2f}s")
         print(f"   🖥️  Server: {health.get('server', 'Unknown')}")
+        print(f"   🗜️  Encoding: {health.get('content_encoding', 'identity')}")
 
 
 async def demonstrate_dynamic_content_handling():
@@ -39,24 +85,17 @@ async def demonstrate_dynamic_content_handling():
     print("\n⚡ Dynamic Content Handling Demonstration")
     print("="*60)
     
-    handler = DynamicContentHandler()
-    
-    # Sample HTML content with different frameworks
-    test_scenarios = [
-        ("React App", '<div id="root" data-reactroot=""></div><script src="/static/js/react.js"></script>'),
-        ("Vue App", '<div id="app"></div><script>window.Vue = {}</script>'),
-        ("Regular Site", '<html><body><h1>Traditional Website</h1></body></html>')
-    ]
+    handler = _dynamic_handler()
     
-    for scenario_name, html_content in test_scenarios:
+    for scenario_name, html_content in _TEST_SCENARIOS:
         print(f"\n🧪 Testing: {scenario_name}")
         
         frameworks = handler.detect_spa_framework(html_content)
         print(f"   📦 Detected frameworks: {[k for k, v in frameworks.items() if v]}")
         
         if any(frameworks.values()):
-            js_code = handler.generate_smart_js_code("https://example.com", frameworks)
-            print(f"   🔧 Generated {len(js_code)} JS handling scripts")
+            js_blocks = handler.generate_smart_js_blocks("https://example.com", frameworks)
+            print(f"   🔧 Generated {len(js_blocks)} JS handling scripts")
         else:
             print("   📄 Traditional static content detected")
 
@@ -66,17 +105,9 @@ async def demonstrate_anti_scraping_intelligence():
     print("\n🛡️ Anti-Scraping Intelligence Demonstration")
     print("="*60)
     
-    handler = AntiScrapingHandler()
-    
-    # Simulate different scenarios
-    scenarios = [
-        ("cloudflare", "Checking your browser before accessing..."),
-        ("captcha", "Please complete the CAPTCHA to continue"),
-        ("rate_limit", "Too many requests from your IP"),
-        ("clean", "Welcome to our news website")
-    ]
+    handler = _anti_scraping_handler()
     
-    for scenario_name, sample_content in scenarios:
+    for scenario_name, sample_content in _ANTI_SCENARIOS:
         print(f"\n🧪 Testing: {scenario_name}")
         
         measures = handler.detect_anti_scraping_measures(sample_content, {})
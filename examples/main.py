@@ -29,6 +29,10 @@ except ImportError as e:
         
         def save_results(self, articles):
             return "fallback_results.json"
+        
+        @classmethod
+        async def close_shared_crawler(cls):
+            pass
 
 
 async def demonstrate_http_mastery():
@@ -146,6 +150,9 @@ async def main():
         print("2. Ensure crawl4ai is properly installed: pip install crawl4ai>=0.6.3")
         print("3. Install Playwright browsers: playwright install")
         print("4. Try running a simple test first")
+    finally:
+        # Release the shared browser before the event loop shuts down
+        await SimpleNewsSystem.close_shared_crawler()
 
 
 def setup_logging():
@@ -3,21 +3,30 @@ Simplified News System for Examples
 """
 
 import asyncio
-import json
+import atexit
 import logging
+import logging.handlers
+import queue
 import random
 import sys
 import os
 from datetime import datetime
-from typing import List, Optional
-from urllib.parse import urlparse
+from itertools import zip_longest
+from typing import Dict, List, Optional, Tuple
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, CacheMode
+from src.core.config import Config
 from src.core.models import NewsArticle, ScrapingStats
+from src.handlers.anti_scraping_handler import AntiScrapingHandler
+from src.handlers.error_handler import RETRYABLE_STATUSES, parse_retry_after
+from src.utils.browser import PagePool, create_crawler
 from src.utils.content_processor import ContentProcessor
+from src.utils.rate_limiter import AdaptiveConcurrencyLimiter, DomainRateLimiter
+from src.utils.serialization import write_json_stream, write_jsonl
+from src.utils.urls import get_netloc
 
 
 class SimpleNewsSystem:
@@ -25,11 +34,40 @@ class SimpleNewsSystem:
     Simplified news scraping system for demonstration purposes
     """
     
+    # Anti-scraping measures that mean the page is a challenge, not an article
+    BLOCKING_MEASURES = ('cloudflare', 'captcha', 'javascript_challenge', 'bot_detection')
+    
+    # Browser shared by every instance for the lifetime of the event loop
+    _shared_crawler: Optional[AsyncWebCrawler] = None
+    _shared_pages: Optional[PagePool] = None
+    _shared_loop: Optional[asyncio.AbstractEventLoop] = None
+    _shared_lock: Optional[asyncio.Lock] = None
+    
     def __init__(self):
         self.content_processor = ContentProcessor()
+        self.anti_scraping = AntiScrapingHandler()
         self.stats = ScrapingStats()
         self.setup_simple_logging()
         
+        # Concurrency limit and per-domain politeness rate
+        self.max_concurrency = Config.SCRAPE_CONCURRENCY
+        self.rate_limiter = DomainRateLimiter(Config.DOMAIN_RATE_LIMIT, Config.DOMAIN_RATE_PERIOD)
+        
+        # Per-domain concurrency that backs off on 429s and challenge pages
+        self.domain_concurrency = AdaptiveConcurrencyLimiter(Config.MAX_CONCURRENCY_PER_DOMAIN)
+        
+        # Run configuration is identical for every URL
+        self.run_config = CrawlerRunConfig(
+            cache_mode=CacheMode.ENABLED,
+            word_count_threshold=20,
+            css_selector='article, main, .content',
+            excluded_tags=['nav', 'footer', 'aside', 'script', 'style'],
+            excluded_selector='.advertisement, .ad, .sidebar',
+            exclude_external_links=True,
+            user_agent_mode='random',
+            verbose=Config.DEBUG
+        )
+        
         # Default test URLs
         self.test_urls = [
             "https://www.bbc.com/news/technology",
@@ -38,78 +76,195 @@ class SimpleNewsSystem:
         ]
     
     def setup_simple_logging(self):
-        """Setup basic logging"""
+        """Setup basic logging
+        
+        Records go through a queue to a background listener thread, so
+        console and file writes never block the event loop.
+        """
+        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+        output_handlers = [
+            logging.StreamHandler(sys.stdout),
+            logging.FileHandler('simple_scraper.log', encoding='utf-8')
+        ]
+        for handler in output_handlers:
+            handler.setFormatter(formatter)
+        
+        queue_handler = logging.handlers.QueueHandler(queue.SimpleQueue())
         logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.StreamHandler(sys.stdout),
-                logging.FileHandler('simple_scraper.log', encoding='utf-8')
-            ]
+            level=logging.DEBUG if Config.DEBUG else logging.INFO,
+            handlers=[queue_handler]
         )
+        
+        # Only start a listener if basicConfig installed our queue handler
+        if queue_handler in logging.getLogger().handlers:
+            listener = logging.handlers.QueueListener(
+                queue_handler.queue, *output_handlers, respect_handler_level=True
+            )
+            listener.start()
+            atexit.register(listener.stop)
+        
         self.logger = logging.getLogger(__name__)
     
-    async def scrape_single_url(self, url: str) -> Optional[NewsArticle]:
-        """Scrape a single URL with basic configuration"""
-        self.logger.info(f"Scraping: {url}")
+    async def __aenter__(self):
+        await self.get_shared_crawler()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        """Leave the shared browser running for the next session
+        
+        Call SimpleNewsSystem.close_shared_crawler() once, before the event loop ends.
+        """
+    
+    @classmethod
+    async def get_shared_crawler(cls) -> AsyncWebCrawler:
+        """Return the shared crawler, launching the browser on first use"""
+        loop = asyncio.get_running_loop()
+        if cls._shared_loop is not loop:
+            # A crawler cannot outlive the event loop it was started on
+            cls._shared_crawler = None
+            cls._shared_loop = loop
+            cls._shared_lock = asyncio.Lock()
+        
+        async with cls._shared_lock:
+            if cls._shared_crawler is None:
+                crawler = create_crawler(verbose=Config.DEBUG)
+                await crawler.start()
+                cls._shared_crawler = crawler
+                cls._shared_pages = PagePool(Config.PAGE_POOL_SIZE, Config.PAGE_MAX_USES)
+        
+        return cls._shared_crawler
+    
+    @classmethod
+    async def close_shared_crawler(cls):
+        """Shut down the shared crawler if it belongs to the running loop
+        
+        This stops the browser for every instance, so call it once at exit.
+        """
+        if cls._shared_crawler is not None and cls._shared_loop is asyncio.get_running_loop():
+            crawler, cls._shared_crawler = cls._shared_crawler, None
+            cls._shared_pages = None
+            await crawler.close()
+    
+    @staticmethod
+    def _retry_after_seconds(headers: dict) -> Optional[float]:
+        """Read a Retry-After header (seconds or HTTP-date), if the server sent one"""
+        return parse_retry_after(headers.get('retry-after') or headers.get('Retry-After'))
+    
+    def _detect_challenge(self, result) -> List[str]:
+        """Return the blocking anti-scraping measures found on a short page"""
+        content = result.markdown or ""
+        if len(content) >= Config.CHALLENGE_PAGE_MAX_LENGTH:
+            return []
+        
+        measures = self.anti_scraping.detect_anti_scraping_measures(
+            content, getattr(result, 'response_headers', None) or {}
+        )
+        return [name for name in self.BLOCKING_MEASURES if measures.get(name)]
+    
+    async def _crawl_with_retry(self, crawler: AsyncWebCrawler, url: str, domain: str):
+        """Crawl a URL, backing off and retrying on rate limits and server errors"""
+        for attempt in range(Config.MAX_RETRIES + 1):
+            await self.rate_limiter.acquire(domain)
+            async with self._shared_pages.session(crawler) as session_id:
+                result = await crawler.arun(url, config=self.run_config.clone(session_id=session_id))
+            
+            status = getattr(result, 'status_code', None)
+            await self.domain_concurrency.record(
+                domain, throttled=status == 429 or bool(self._detect_challenge(result))
+            )
+            
+            if status not in RETRYABLE_STATUSES or attempt == Config.MAX_RETRIES:
+                return result
+            
+            headers = getattr(result, 'response_headers', None) or {}
+            delay = self._retry_after_seconds(headers)
+            if delay is None:
+                delay = Config.BACKOFF_FACTOR ** attempt + random.random()
+            delay = min(delay, Config.MAX_DELAY)
+            
+            self.logger.warning(f"HTTP {status} from {domain}, retry {attempt + 1} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+    
+    async def scrape_single_url(
+        self, url: str, domain: str = None, analyze_content: bool = True
+    ) -> Optional[NewsArticle]:
+        """Scrape a single URL with basic configuration
+        
+        With analyze_content=False only metadata tags are attached and
+        sentiment is left unset, so callers can analyze articles in a batch.
+        """
+        self.logger.debug(f"Scraping: {url}")
         self.stats.total_requests += 1
         
+        if domain is None:
+            domain = get_netloc(url)
+        
         try:
-            # Create basic configuration
-            config = CrawlerRunConfig(
-                cache_mode=CacheMode.ENABLED,
-                word_count_threshold=20,
-                css_selector='article, main, .content',
-                excluded_tags=['nav', 'footer', 'aside', 'script', 'style'],
-                excluded_selector='.advertisement, .ad, .sidebar',
-                exclude_external_links=True,
-                user_agent_mode='random',
-                verbose=True
-            )
+            crawler = await self.get_shared_crawler()
+            async with self.domain_concurrency.slot(domain):
+                result = await self._crawl_with_retry(crawler, url, domain)
             
-            # Scrape the URL
-            async with AsyncWebCrawler(verbose=True) as crawler:
-                result = await crawler.arun(url, config=config)
-                
-                if not result.success:
-                    raise Exception(f"Scraping failed: {result.error}")
-                
-                # Extract basic information
-                title = ""
-                content = result.markdown or ""
-                
-                # Try to extract title from metadata
-                if hasattr(result, 'metadata') and result.metadata:
-                    title = result.metadata.get('title', '')
-                
-                # Clean the content
+            if not result.success:
+                raise Exception(f"Scraping failed: {result.error}")
+            
+            # Extract basic information
+            title = ""
+            content = (result.markdown or "")[:Config.MAX_HTML_LENGTH]
+            
+            # Skip cleaning and analysis for empty pages and short challenge pages
+            if len(content) < Config.MIN_PAGE_CONTENT_LENGTH:
+                raise Exception(f"Insufficient content ({len(content)} chars)")
+            
+            blocked = self._detect_challenge(result)
+            if blocked:
+                raise Exception(f"Blocked by anti-scraping measures: {', '.join(blocked)}")
+            
+            # Try to extract title from metadata
+            if hasattr(result, 'metadata') and result.metadata:
+                title = result.metadata.get('title', '')
+            
+            if analyze_content:
+                # Clean, tag and score in one pass over a single lowercase copy
+                content, tags, sentiment = self.content_processor.process_all(content, result)
+            else:
                 content = self.content_processor.clean_and_enhance_content(content)
-                
-                # Extract tags
-                tags = self.content_processor.extract_tags(content, result)
-                
-                # Analyze sentiment
-                sentiment = self.content_processor.analyze_sentiment(content)
-                
-                # Create article object
-                article = NewsArticle(
-                    url=url,
-                    title=self.content_processor.clean_text(title),
-                    content=content,
-                    tags=tags,
-                    source_domain=urlparse(url).netloc,
-                    sentiment_score=sentiment
-                )
-                
-                self.stats.successful_requests += 1
-                self.logger.info(f"Successfully extracted: {article.title[:50]}...")
-                return article
+                # Metadata keywords only; content analysis happens later in a batch
+                tags = self.content_processor.extract_tags("", result)
+                sentiment = None
+            
+            # Create article object
+            article = NewsArticle(
+                url=url,
+                title=self.content_processor.clean_text(title),
+                content=content,
+                tags=tags,
+                source_domain=domain,
+                sentiment_score=sentiment
+            )
+            
+            self.stats.successful_requests += 1
+            self.logger.info(f"Successfully extracted: {article.title[:50]}...")
+            return article
                 
         except Exception as e:
             self.stats.failed_requests += 1
             self.logger.error(f"Failed to scrape {url}: {e}")
             return None
     
+    @staticmethod
+    def _interleave_by_domain(targets: List[Tuple[str, str]]) -> List[Tuple[int, str, str]]:
+        """Order (url, domain) targets round-robin by domain, keeping 1-based positions"""
+        by_domain: Dict[str, List[Tuple[int, str, str]]] = {}
+        for i, (url, domain) in enumerate(targets, 1):
+            by_domain.setdefault(domain, []).append((i, url, domain))
+        
+        return [
+            target
+            for round_targets in zip_longest(*by_domain.values())
+            for target in round_targets
+            if target is not None
+        ]
+    
     async def run_comprehensive_scraping(self, urls: List[str] = None) -> List[NewsArticle]:
         """Run scraping on multiple URLs"""
         if urls is None:
@@ -118,25 +273,47 @@ class SimpleNewsSystem:
         self.logger.info(f"Starting scraping of {len(urls)} URLs")
         self.stats.start_time = datetime.now()
         
-        articles = []
+        semaphore = asyncio.Semaphore(self.max_concurrency)
         
-        for i, url in enumerate(urls, 1):
-            self.logger.info(f"Processing {i}/{len(urls)}: {url}")
-            
-            article = await self.scrape_single_url(url)
-            if article:
-                articles.append(article)
-            
-            # Add delay between requests
-            if i < len(urls):
-                delay = random.uniform(2, 4)
-                await asyncio.sleep(delay)
+        # Parse each URL once up front
+        targets = [(url, get_netloc(url)) for url in urls]
+        
+        async def scrape_bounded(i: int, url: str, domain: str) -> Optional[NewsArticle]:
+            async with semaphore:
+                self.logger.info(f"Processing {i}/{len(urls)}: {url}")
+                return await self.scrape_single_url(url, domain, analyze_content=False)
+        
+        await self.get_shared_crawler()
+        
+        # Start tasks round-robin across domains so one domain's queue cannot
+        # hold every global slot while waiting on its own per-domain limit
+        tasks = {
+            i: asyncio.ensure_future(scrape_bounded(i, url, domain))
+            for i, url, domain in self._interleave_by_domain(targets)
+        }
+        results = await asyncio.gather(
+            *(tasks[i] for i in range(1, len(targets) + 1)),
+            return_exceptions=True
+        )
+        
+        articles = [result for result in results if isinstance(result, NewsArticle)]
+        self.analyze_articles(articles)
         
         self.stats.end_time = datetime.now()
         self.generate_simple_report(articles)
         
         return articles
     
+    def analyze_articles(self, articles: List[NewsArticle]):
+        """Run tag extraction and sentiment analysis over all articles at once"""
+        contents = [article.content for article in articles]
+        content_tags = self.content_processor.extract_tags_batch(contents)
+        sentiments = self.content_processor.analyze_sentiment_batch(contents)
+        
+        for article, tags, sentiment in zip(articles, content_tags, sentiments):
+            article.tags = list(set(article.tags).union(tags))[:Config.MAX_TAGS]
+            article.sentiment_score = sentiment
+    
     def generate_simple_report(self, articles: List[NewsArticle]):
         """Generate a simple scraping report"""
         self.logger.info("\n" + "=" * 60)
@@ -158,32 +335,37 @@ class SimpleNewsSystem:
             self.logger.info(f"Average Content Length: {avg_length:.0f} chars")
             self.logger.info(f"Average Sentiment: {avg_sentiment:.2f}")
     
+    @staticmethod
+    def _article_row(article: NewsArticle) -> dict:
+        """Serializable summary of an article, with a 500-char content preview"""
+        return {
+            'url': article.url,
+            'title': article.title,
+            'content': article.content[:500] + "..." if len(article.content) > 500 else article.content,
+            'tags': article.tags,
+            'source_domain': article.source_domain,
+            'sentiment_score': article.sentiment_score,
+            'content_length': article.content_length
+        }
+    
     def save_results(self, articles: List[NewsArticle], filename: str = None) -> str:
-        """Save results to JSON file"""
+        """Save results to a JSON file, or JSON Lines if filename ends in .jsonl"""
         if filename is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"simple_scraping_results_{timestamp}.json"
         
-        # Convert to dict format
-        data = {
+        header = {
             'timestamp': datetime.now().isoformat(),
-            'total_articles': len(articles),
-            'articles': []
+            'total_articles': len(articles)
         }
         
-        for article in articles:
-            data['articles'].append({
-                'url': article.url,
-                'title': article.title,
-                'content': article.content[:500] + "..." if len(article.content) > 500 else article.content,
-                'tags': article.tags,
-                'source_domain': article.source_domain,
-                'sentiment_score': article.sentiment_score,
-                'content_length': article.content_length
-            })
+        article_rows = (self._article_row(article) for article in articles)
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        if filename.endswith('.jsonl'):
+            # JSON Lines: one article per line, no wrapping document
+            write_jsonl(filename, article_rows)
+        else:
+            write_json_stream(filename, header, 'articles', article_rows)
         
         self.logger.info(f"Results saved to: {filename}")
         return filename
@@ -194,15 +376,18 @@ async def test_simple_system():
     """Test the simple news system"""
     print("Testing Simple News System...")
     
-    system = SimpleNewsSystem()
-    
     # Test with a few URLs
     test_urls = [
         "https://www.bbc.com/news/technology",
         "https://techcrunch.com/"
     ]
     
-    articles = await system.run_comprehensive_scraping(test_urls)
+    # All URLs go through one call so they share the browser session
+    try:
+        async with SimpleNewsSystem() as system:
+            articles = await system.run_comprehensive_scraping(test_urls)
+    finally:
+        await SimpleNewsSystem.close_shared_crawler()
     
     if articles:
         filename = system.save_results(articles)
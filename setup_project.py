@@ -103,11 +103,13 @@ try:
     
     async def quick_test():
         print("🧪 Running quick test...")
-        system = SimpleNewsSystem()
-        
         # Test with one URL
         test_urls = ["https://www.bbc.com/news"]
-        articles = await system.run_comprehensive_scraping(test_urls)
+        try:
+            async with SimpleNewsSystem() as system:
+                articles = await system.run_comprehensive_scraping(test_urls)
+        finally:
+            await SimpleNewsSystem.close_shared_crawler()
         
         if articles:
             print(f"✅ Test successful! Extracted {len(articles)} articles")
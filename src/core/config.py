@@ -2,7 +2,8 @@
 Configuration settings for the web scraping system
 """
 
-from typing import List, Dict
+from types import MappingProxyType
+from typing import List, Mapping
 
 
 class Config:
@@ -23,6 +24,17 @@ class Config:
     BASE_DELAY: float = 1.0
     MAX_DELAY: float = 60.0
     BACKOFF_FACTOR: float = 2.0
+    DNS_CACHE_TTL: int = 300
+    CONDITIONAL_CACHE_FILE: str = 'data/conditional_cache.json'  # ETag/Last-Modified sidecar
+    CONDITIONAL_CACHE_SIZE: int = 500  # URLs kept in the sidecar, least recently used dropped
+    ANALYSIS_CACHE_TTL: int = 3600  # Seconds a domain's pre-scraping analysis is reused
+    
+    # Per-domain request rate (requests per period in seconds)
+    DOMAIN_RATE_LIMIT: int = 1
+    DOMAIN_RATE_PERIOD: float = 3.0
+    MAX_CONCURRENCY_PER_DOMAIN: int = 4
+    SCRAPE_CONCURRENCY: int = 10  # Sources scraped at once by NewsIntelligenceSystem
+    ANALYSIS_CONCURRENCY: int = 32  # Pre-scraping probes in flight at once
     
     # User agents for rotation
     USER_AGENTS: List[str] = [
@@ -31,8 +43,8 @@ class Config:
         "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
     ]
     
-    # Domain-specific delays
-    DOMAIN_DELAYS: Dict[str, float] = {
+    # Domain-specific delays (read-only: the single source for every consumer)
+    DOMAIN_DELAYS: Mapping[str, float] = MappingProxyType({
         'bbc.com': 2.0,
         'cnn.com': 1.5,
         'reuters.com': 2.0,
@@ -40,10 +52,14 @@ class Config:
         'wsj.com': 4.0,
         'techcrunch.com': 2.5,
         'theguardian.com': 2.0
-    }
+    })
     
     # Content filtering settings
     MIN_CONTENT_LENGTH: int = 50
+    MIN_PAGE_CONTENT_LENGTH: int = 200
+    CHALLENGE_PAGE_MAX_LENGTH: int = 2000
+    MIN_SAMPLE_TEXT_LENGTH: int = 500  # Below this a static non-article page is not crawled
+    MAX_HTML_LENGTH: int = 4 << 20  # Characters of a page kept for parsing
     MIN_WORD_THRESHOLD: int = 20
     CONTENT_FILTER_THRESHOLD: float = 0.48
     
@@ -52,7 +68,21 @@ class Config:
     MAX_SCROLL_ATTEMPTS: int = 5
     WAIT_TIMEOUT: int = 30000
     
+    # Browser settings: lean Chromium flags and resource types never downloaded
+    BROWSER_EXTRA_ARGS: List[str] = [
+        "--disable-gpu",
+        "--disable-dev-shm-usage",
+        "--disable-extensions",
+        "--disable-background-networking",
+        "--mute-audio",
+        "--no-sandbox"
+    ]
+    BLOCKED_RESOURCE_TYPES: List[str] = ['image', 'font', 'media', 'stylesheet']
+    PAGE_POOL_SIZE: int = 4
+    PAGE_MAX_USES: int = 50
+    
     # Logging settings
+    DEBUG: bool = False
     LOG_FILE: str = 'news_scraper.log'
     LOG_FORMAT: str = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     
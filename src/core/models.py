@@ -2,13 +2,19 @@
 Data models for the web scraping system
 """
 
+import sys
 from dataclasses import dataclass
 from datetime import datetime
 from typing import List, Dict, Any, Optional
-from urllib.parse import urlparse
 
+from ..utils.urls import get_netloc
 
-@dataclass
+
+# Slotted dataclasses (no per-instance __dict__) need Python 3.10+
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
 class NewsArticle:
     """Structured data model for news articles"""
     url: str
@@ -32,10 +38,10 @@ class NewsArticle:
         if not self.content_length:
             self.content_length = len(self.content)
         if not self.source_domain and self.url:
-            self.source_domain = urlparse(self.url).netloc
+            self.source_domain = get_netloc(self.url)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ScrapingStats:
     """Statistics tracking for scraping operations"""
     total_requests: int = 0
@@ -50,4 +56,4 @@ class ScrapingStats:
         if self.errors is None:
             self.errors = []
         if self.start_time is None:
-            self.start_time = datetime.now()
\ No newline at end of file
+            self.start_time = datetime.now()
@@ -2,16 +2,145 @@
 Advanced data extraction engine
 """
 
-import json
+import asyncio
 import logging
-from typing import Dict, Any
-from urllib.parse import urlparse
+import re
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 from crawl4ai import AsyncWebCrawler, CacheMode, CrawlerRunConfig
-from crawl4ai.extraction_strategy import (
-    JsonCssExtractionStrategy, 
-    CosineStrategy
+from crawl4ai.content_scraping_strategy import LXMLWebScrapingStrategy
+from crawl4ai.extraction_strategy import CosineStrategy
+from lxml import etree, html as lxml_html
+from .selector_intelligence import SelectorIntelligence, _SELECTOR_XPATHS, _css_translator
+from ..core.config import Config
+from ..utils.browser import create_crawler
+from ..utils.urls import get_netloc
+
+
+# Page metadata fields shared by every schema
+_METADATA_FIELDS = (
+    {
+        "name": "meta_description",
+        "selector": "meta[name='description']",
+        "type": "attribute",
+        "attribute": "content"
+    },
+    {
+        "name": "meta_keywords",
+        "selector": "meta[name='keywords']",
+        "type": "attribute", 
+        "attribute": "content"
+    },
+    {
+        "name": "og_title",
+        "selector": "meta[property='og:title']",
+        "type": "attribute",
+        "attribute": "content"
+    },
+    {
+        "name": "canonical_url",
+        "selector": "link[rel='canonical']",
+        "type": "attribute",
+        "attribute": "href"
+    }
+)
+
+
+@lru_cache(maxsize=64)
+def _build_schema(domain: str) -> Dict[str, Any]:
+    """Build the extraction schema for a domain (memoized per domain; callers copy it)"""
+    chains = SelectorIntelligence.get_selector_chains_for_domain(domain)
+    
+    schema = {
+        "name": f"News Article Extraction - {domain}",
+        "baseSelector": "html",
+        "fields": []
+    }
+    
+    # Add fields with pre-joined CSS fallback chains
+    for field_name, selector_chain in chains.items():
+        schema["fields"].append({
+            "name": field_name,
+            "selector": selector_chain,
+            "type": "text",
+            "multiple": field_name == "content",  # Content can have multiple paragraphs
+            "transform": "strip"
+        })
+    
+    # Add metadata fields
+    schema["fields"].extend(_METADATA_FIELDS)
+    
+    return schema
+
+
+# Metadata fields keyed by the element that carries them: (tag, key attribute,
+# key value) -> (field name, value attribute), e.g. meta[name='description']
+_METADATA_KEYS: Dict[tuple, tuple] = {
+    re.fullmatch(r"(\w+)\[(\w+)='([^']+)'\]", field["selector"]).groups(): (field["name"], field["attribute"])
+    for field in _METADATA_FIELDS
+}
+_METADATA_KEY_ATTRIBUTES = tuple({key_attribute for _, key_attribute, _ in _METADATA_KEYS})
+
+# All metadata selectors as one union XPath, evaluated in a single tree walk
+_METADATA_XPATH = etree.XPath(
+    " | ".join(_css_translator.css_to_xpath(field["selector"]) for field in _METADATA_FIELDS)
 )
-from .selector_intelligence import SelectorIntelligence
+
+
+def _extract_compiled_fields(html: str, domain: str) -> List[Dict[str, Any]]:
+    """Extract schema fields by running precompiled XPaths over one parsed tree
+    
+    Produces the same shape as the JSON CSS strategy for the adaptive schema:
+    a single item whose content field is a list of paragraphs.
+    """
+    tree = lxml_html.fromstring(html)
+    item = {}
+    
+    for field_name, xpath in _SELECTOR_XPATHS[SelectorIntelligence._match_pattern(domain)].items():
+        elements = xpath(tree)
+        if field_name == "content":
+            paragraphs = (element.text_content().strip() for element in elements)
+            item[field_name] = [paragraph for paragraph in paragraphs if paragraph]
+        elif elements:
+            item[field_name] = elements[0].text_content().strip()
+    
+    # Elements come back in document order; the first match for a field wins
+    for element in _METADATA_XPATH(tree):
+        for key_attribute in _METADATA_KEY_ATTRIBUTES:
+            field = _METADATA_KEYS.get((element.tag, key_attribute, element.get(key_attribute)))
+            if field is not None:
+                field_name, attribute = field
+                value = element.get(attribute)
+                if field_name not in item and value is not None:
+                    item[field_name] = value
+                break
+    
+    return [item]
+
+
+# Editorial focus per news brand, keyed by domain label ('bbc' in 'www.bbc.co.uk')
+_LLM_FOCUS: Dict[str, str] = {
+    'bbc': "BBC-style journalism with focus on balanced reporting",
+    'cnn': "CNN-style breaking news with emphasis on timeliness",
+    'reuters': "Reuters-style factual reporting with international perspective"
+}
+
+
+@lru_cache(maxsize=256)
+def _llm_focus(domain: str) -> str:
+    """Pick the prompt focus for a domain by looking up each of its labels"""
+    for label in domain.split('.'):
+        focus = _LLM_FOCUS.get(label)
+        if focus:
+            return focus
+    
+    return "general news article structure"
+
+
+# Extraction strategies in default order, with their result keys and labels
+_STRATEGIES = ('css', 'llm', 'semantic')
+_STRATEGY_KEYS = {'css': 'css_extraction', 'llm': 'llm_extraction', 'semantic': 'semantic_extraction'}
+_STRATEGY_LABELS = {'css': 'CSS', 'llm': 'LLM', 'semantic': 'Semantic'}
 
 
 class IntelligentExtractor:
@@ -22,70 +151,18 @@ class IntelligentExtractor:
     def __init__(self):
         self.selector_intelligence = SelectorIntelligence()
         self.logger = logging.getLogger(__name__)
+        # Per-domain strategy order, most recently successful first
+        self._strategy_rank: Dict[str, List[str]] = {}
     
     def create_adaptive_schema(self, url: str) -> Dict[str, Any]:
         """Create adaptive extraction schema based on URL analysis"""
-        domain = urlparse(url).netloc
-        selectors = self.selector_intelligence.get_selectors_for_domain(domain)
-        
-        schema = {
-            "name": f"News Article Extraction - {domain}",
-            "baseSelector": "html",
-            "fields": []
-        }
-        
-        # Add fields with fallback selectors
-        for field_name, field_selectors in selectors.items():
-            schema["fields"].append({
-                "name": field_name,
-                "selector": ", ".join(field_selectors),  # CSS fallback chain
-                "type": "text",
-                "multiple": field_name == "content",  # Content can have multiple paragraphs
-                "transform": "strip"
-            })
-        
-        # Add metadata fields
-        schema["fields"].extend([
-            {
-                "name": "meta_description",
-                "selector": "meta[name='description']",
-                "type": "attribute",
-                "attribute": "content"
-            },
-            {
-                "name": "meta_keywords",
-                "selector": "meta[name='keywords']",
-                "type": "attribute", 
-                "attribute": "content"
-            },
-            {
-                "name": "og_title",
-                "selector": "meta[property='og:title']",
-                "type": "attribute",
-                "attribute": "content"
-            },
-            {
-                "name": "canonical_url",
-                "selector": "link[rel='canonical']",
-                "type": "attribute",
-                "attribute": "href"
-            }
-        ])
-        
-        return schema
+        schema = _build_schema(get_netloc(url))
+        # The cached schema is shared, so hand out a copy the caller may modify
+        return {**schema, "fields": [dict(field) for field in schema["fields"]]}
     
     def create_llm_extraction_prompt(self, url: str) -> str:
         """Create intelligent LLM extraction prompt"""
-        domain = urlparse(url).netloc
-        
-        if 'bbc' in domain:
-            focus = "BBC-style journalism with focus on balanced reporting"
-        elif 'cnn' in domain:
-            focus = "CNN-style breaking news with emphasis on timeliness"
-        elif 'reuters' in domain:
-            focus = "Reuters-style factual reporting with international perspective"
-        else:
-            focus = "general news article structure"
+        focus = _llm_focus(get_netloc(url))
         
         return f"""
         Extract comprehensive information from this {focus} article:
@@ -104,32 +181,109 @@ class IntelligentExtractor:
         Focus on accuracy and completeness. If any information is not available, mark it as "Not Available".
         """
     
-    async def extract_with_multiple_strategies(self, url: str, crawler: AsyncWebCrawler = None) -> Dict[str, Any]:
-        """Use multiple extraction strategies and combine results"""
-        results = {}
+    async def _fetch_page(self, url: str, crawler: AsyncWebCrawler = None) -> Any:
+        """Fetch and scrape a page once for all extraction strategies"""
+        config = CrawlerRunConfig(
+            scraping_strategy=LXMLWebScrapingStrategy(),
+            cache_mode=CacheMode.ENABLED
+        )
         
-        # Create crawler if not provided
         if crawler is None:
-            crawler = AsyncWebCrawler()
+            async with create_crawler() as own_crawler:
+                return await own_crawler.arun(url, config=config)
+        
+        return await crawler.arun(url, config=config)
+    
+    async def extract_with_multiple_strategies(
+        self, url: str, crawler: AsyncWebCrawler = None, crawl_result: Any = None,
+        order: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
+        """Use multiple extraction strategies and combine results
+        
+        The page is fetched once (or taken from crawl_result) and every
+        strategy runs in-process against that single copy. Strategies run
+        in `order` (default: the domain's learned order) and the first one
+        that yields enough content ends the run; it then moves to the front
+        of that domain's order for next time.
+        """
+        results = {}
         
-        # Strategy 1: CSS-based extraction
         try:
-            schema = self.create_adaptive_schema(url)
-            css_strategy = JsonCssExtractionStrategy(schema, verbose=False)
+            if crawl_result is None:
+                crawl_result = await self._fetch_page(url, crawler)
+            if not crawl_result.success:
+                raise Exception(f"Crawling failed: {crawl_result.error_message}")
+        except Exception as e:
+            self.logger.error(f"Page fetch for extraction failed: {e}")
+            error = {'error': str(e)}
+            return {'css_extraction': error, 'llm_extraction': error, 'semantic_extraction': error}
+        
+        html = crawl_result.html or ""
+        markdown = str(crawl_result.markdown or "")
+        
+        # Bound parse memory and CPU on pathological pages
+        if len(html) > Config.MAX_HTML_LENGTH:
+            self.logger.warning(f"Truncating {len(html)}-char page {url} to {Config.MAX_HTML_LENGTH} chars")
+            html = html[:Config.MAX_HTML_LENGTH]
+        markdown = markdown[:Config.MAX_HTML_LENGTH]
+        
+        domain = get_netloc(url)
+        order = tuple(order) if order is not None else self.strategy_order(domain)
+        
+        # Run strategies in order and stop at the first that yields enough content
+        winner = None
+        for name in order:
+            if winner is not None:
+                results[_STRATEGY_KEYS[name]] = {
+                    'status': f"Skipped - {_STRATEGY_LABELS[winner]} extraction sufficient"
+                }
+                continue
             
-            css_config = CrawlerRunConfig(
-                extraction_strategy=css_strategy,
-                cache_mode=CacheMode.ENABLED
-            )
+            if name == 'css':
+                result, sufficient = await self._run_css(html, domain)
+            elif name == 'llm':
+                result, sufficient = self._run_llm(url)
+            else:
+                result, sufficient = await self._run_semantic(url, markdown)
+            
+            if result is not None:
+                results[_STRATEGY_KEYS[name]] = result
+            if sufficient:
+                winner = name
+                self._promote_strategy(domain, name)
+        
+        return results
+    
+    def strategy_order(self, domain: str) -> Tuple[str, ...]:
+        """Strategies for a domain, most recently successful first"""
+        return tuple(self._strategy_rank.get(domain, _STRATEGIES))
+    
+    def _promote_strategy(self, domain: str, name: str):
+        """Move a strategy that just succeeded to the front of the domain's order"""
+        rank = self._strategy_rank.get(domain)
+        if rank is None:
+            rank = self._strategy_rank[domain] = list(_STRATEGIES)
+        if rank[0] != name:
+            rank.remove(name)
+            rank.insert(0, name)
+    
+    async def _run_css(self, html: str, domain: str) -> Tuple[Any, bool]:
+        """Strategy 1: CSS-based extraction (selector chains precompiled to XPath)"""
+        try:
+            css_data = None
+            if html:
+                css_data = await asyncio.to_thread(_extract_compiled_fields, html, domain)
+            if not css_data:
+                return None, False
             
-            css_result = await crawler.arun(url, config=css_config)
-            if css_result.extracted_content:
-                results['css_extraction'] = json.loads(css_result.extracted_content)
+            css_content_length = sum(len(paragraph) for paragraph in css_data[0].get('content', []))
+            return css_data, css_content_length >= Config.MIN_CONTENT_LENGTH
         except Exception as e:
             self.logger.error(f"CSS extraction failed: {e}")
-            results['css_extraction'] = {'error': str(e)}
-        
-        # Strategy 2: LLM-based extraction (placeholder - requires API key)
+            return {'error': str(e)}, False
+    
+    def _run_llm(self, url: str) -> Tuple[Any, bool]:
+        """Strategy 2: LLM-based extraction (placeholder - requires API key)"""
         try:
             llm_prompt = self.create_llm_extraction_prompt(url)
             # Note: This would require an LLM API key
@@ -138,14 +292,14 @@ class IntelligentExtractor:
             #     api_token="your_api_key",
             #     instruction=llm_prompt
             # )
-            # llm_result = await crawler.arun(url, extraction_strategy=llm_strategy)
-            # results['llm_extraction'] = json.loads(llm_result.extracted_content)
-            results['llm_extraction'] = {'status': 'LLM API key required for advanced extraction'}
+            # return await asyncio.to_thread(llm_strategy.run, url, [markdown]), True
+            return {'status': 'LLM API key required for advanced extraction'}, False
         except Exception as e:
             self.logger.error(f"LLM extraction failed: {e}")
-            results['llm_extraction'] = {'error': str(e)}
-        
-        # Strategy 3: Semantic clustering for content analysis
+            return {'error': str(e)}, False
+    
+    async def _run_semantic(self, url: str, markdown: str) -> Tuple[Any, bool]:
+        """Strategy 3: semantic clustering (reached only when earlier strategies fell short)"""
         try:
             semantic_strategy = CosineStrategy(
                 semantic_filter="news article content, journalism, current events",
@@ -154,16 +308,13 @@ class IntelligentExtractor:
                 top_k=5
             )
             
-            semantic_config = CrawlerRunConfig(
-                extraction_strategy=semantic_strategy,
-                cache_mode=CacheMode.ENABLED
-            )
+            semantic_data = await asyncio.to_thread(semantic_strategy.run, url, [markdown])
+            if not semantic_data:
+                return None, False
             
-            semantic_result = await crawler.arun(url, config=semantic_config)
-            if semantic_result.extracted_content:
-                results['semantic_extraction'] = json.loads(semantic_result.extracted_content)
+            semantic_length = sum(len(str(block.get('content', ''))) for block in semantic_data
+                                  if isinstance(block, dict))
+            return semantic_data, semantic_length >= Config.MIN_CONTENT_LENGTH
         except Exception as e:
             self.logger.error(f"Semantic extraction failed: {e}")
-            results['semantic_extraction'] = {'error': str(e)}
-        
-        return results
\ No newline at end of file
+            return {'error': str(e)}, False
@@ -2,8 +2,169 @@
 Intelligent CSS selector generation for different websites
 """
 
+from functools import lru_cache
 from typing import Dict, List, Any
 
+from cssselect import GenericTranslator
+from lxml import etree
+
+
+_NEWS_SELECTORS: Dict[str, Dict[str, List[str]]] = {
+    'bbc.com': {
+        'title': [
+            'h1[data-testid="headline"]',
+            'h1.story-headline',
+            'h1',
+            '.headline h1'
+        ],
+        'content': [
+            '[data-component="text-block"] p',
+            '.story-body p',
+            '.entry-content p',
+            'article p'
+        ],
+        'author': [
+            '[data-testid="byline"]',
+            '.byline',
+            '.author',
+            '.journalist'
+        ],
+        'date': [
+            '[data-testid="timestamp"]',
+            'time',
+            '.date',
+            '.published'
+        ],
+        'category': [
+            '.category',
+            '.section',
+            '.topic'
+        ]
+    },
+    
+    'cnn.com': {
+        'title': [
+            'h1.headline__text',
+            'h1[data-analytics="headline"]',
+            'h1',
+            '.headline h1'
+        ],
+        'content': [
+            '.zn-body__paragraph',
+            '.zn-body p',
+            '.article-content p',
+            'article p'
+        ],
+        'author': [
+            '.byline__name',
+            '.metadata__byline',
+            '.byline',
+            '.author'
+        ],
+        'date': [
+            '.timestamp',
+            '.update-time',
+            'time',
+            '.date'
+        ],
+        'category': [
+            '.metadata__section',
+            '.section',
+            '.category'
+        ]
+    },
+    
+    'reuters.com': {
+        'title': [
+            '[data-testid="Heading"]',
+            'h1[data-module="ArticleHeader"]',
+            'h1',
+            '.article-header h1'
+        ],
+        'content': [
+            '[data-testid="paragraph"]',
+            '.article-body p',
+            '.content p',
+            'article p'
+        ],
+        'author': [
+            '[data-testid="byline"]',
+            '.author',
+            '.byline'
+        ],
+        'date': [
+            '[data-testid="dateTime"]',
+            'time',
+            '.date'
+        ],
+        'category': [
+            '.kicker',
+            '.section',
+            '.category'
+        ]
+    },
+    
+    # Generic fallback selectors for unknown sites
+    'generic': {
+        'title': [
+            'h1',
+            '.title h1',
+            '.headline h1',
+            '.entry-title',
+            '.article-title',
+            '[itemprop="headline"]'
+        ],
+        'content': [
+            'article p',
+            '.content p',
+            '.entry-content p',
+            '.article-content p',
+            '.post-content p',
+            '.story p',
+            '[itemprop="articleBody"] p'
+        ],
+        'author': [
+            '.author',
+            '.byline',
+            '.writer',
+            '[rel="author"]',
+            '[itemprop="author"]',
+            '.journalist'
+        ],
+        'date': [
+            'time',
+            '.date',
+            '.published',
+            '.publish-date',
+            '[datetime]',
+            '[itemprop="datePublished"]'
+        ],
+        'category': [
+            '.category',
+            '.section',
+            '.topic',
+            '.tag'
+        ]
+    }
+}
+
+# CSS fallback chains, pre-joined once so schema building is a dict lookup
+_SELECTOR_CHAINS: Dict[str, Dict[str, str]] = {
+    pattern: {field: ", ".join(field_selectors) for field, field_selectors in fields.items()}
+    for pattern, fields in _NEWS_SELECTORS.items()
+}
+
+
+# Each fallback chain compiled once to an lxml XPath, evaluated directly on parsed trees
+_css_translator = GenericTranslator()
+_SELECTOR_XPATHS: Dict[str, Dict[str, etree.XPath]] = {
+    pattern: {
+        field: etree.XPath(_css_translator.css_to_xpath(selector_chain))
+        for field, selector_chain in chains.items()
+    }
+    for pattern, chains in _SELECTOR_CHAINS.items()
+}
+
 
 class SelectorIntelligence:
     """
@@ -12,154 +173,42 @@ class SelectorIntelligence:
     
     @staticmethod
     def generate_news_selectors() -> Dict[str, Dict[str, Any]]:
-        """Generate intelligent selectors for different news websites"""
+        """Generate intelligent selectors for different news websites (a fresh copy)"""
         return {
-            'bbc.com': {
-                'title': [
-                    'h1[data-testid="headline"]',
-                    'h1.story-headline',
-                    'h1',
-                    '.headline h1'
-                ],
-                'content': [
-                    '[data-component="text-block"] p',
-                    '.story-body p',
-                    '.entry-content p',
-                    'article p'
-                ],
-                'author': [
-                    '[data-testid="byline"]',
-                    '.byline',
-                    '.author',
-                    '.journalist'
-                ],
-                'date': [
-                    '[data-testid="timestamp"]',
-                    'time',
-                    '.date',
-                    '.published'
-                ],
-                'category': [
-                    '.category',
-                    '.section',
-                    '.topic'
-                ]
-            },
-            
-            'cnn.com': {
-                'title': [
-                    'h1.headline__text',
-                    'h1[data-analytics="headline"]',
-                    'h1',
-                    '.headline h1'
-                ],
-                'content': [
-                    '.zn-body__paragraph',
-                    '.zn-body p',
-                    '.article-content p',
-                    'article p'
-                ],
-                'author': [
-                    '.byline__name',
-                    '.metadata__byline',
-                    '.byline',
-                    '.author'
-                ],
-                'date': [
-                    '.timestamp',
-                    '.update-time',
-                    'time',
-                    '.date'
-                ],
-                'category': [
-                    '.metadata__section',
-                    '.section',
-                    '.category'
-                ]
-            },
-            
-            'reuters.com': {
-                'title': [
-                    '[data-testid="Heading"]',
-                    'h1[data-module="ArticleHeader"]',
-                    'h1',
-                    '.article-header h1'
-                ],
-                'content': [
-                    '[data-testid="paragraph"]',
-                    '.article-body p',
-                    '.content p',
-                    'article p'
-                ],
-                'author': [
-                    '[data-testid="byline"]',
-                    '.author',
-                    '.byline'
-                ],
-                'date': [
-                    '[data-testid="dateTime"]',
-                    'time',
-                    '.date'
-                ],
-                'category': [
-                    '.kicker',
-                    '.section',
-                    '.category'
-                ]
-            },
-            
-            # Generic fallback selectors for unknown sites
-            'generic': {
-                'title': [
-                    'h1',
-                    '.title h1',
-                    '.headline h1',
-                    '.entry-title',
-                    '.article-title',
-                    '[itemprop="headline"]'
-                ],
-                'content': [
-                    'article p',
-                    '.content p',
-                    '.entry-content p',
-                    '.article-content p',
-                    '.post-content p',
-                    '.story p',
-                    '[itemprop="articleBody"] p'
-                ],
-                'author': [
-                    '.author',
-                    '.byline',
-                    '.writer',
-                    '[rel="author"]',
-                    '[itemprop="author"]',
-                    '.journalist'
-                ],
-                'date': [
-                    'time',
-                    '.date',
-                    '.published',
-                    '.publish-date',
-                    '[datetime]',
-                    '[itemprop="datePublished"]'
-                ],
-                'category': [
-                    '.category',
-                    '.section',
-                    '.topic',
-                    '.tag'
-                ]
-            }
+            pattern: {field: list(field_selectors) for field, field_selectors in fields.items()}
+            for pattern, fields in _NEWS_SELECTORS.items()
         }
     
     @staticmethod
-    def get_selectors_for_domain(domain: str) -> Dict[str, List[str]]:
-        """Get appropriate selectors for a specific domain"""
-        selectors = SelectorIntelligence.generate_news_selectors()
+    @lru_cache(maxsize=256)
+    def _match_pattern(domain: str) -> str:
+        """Find the selector table key for a domain by looking up each dot-suffix
         
-        # Find matching domain pattern
-        for pattern, domain_selectors in selectors.items():
-            if pattern in domain or pattern == 'generic':
-                return domain_selectors
+        'edition.cnn.com' tries 'edition.cnn.com', then 'cnn.com', then 'com',
+        so a match costs a few dict lookups instead of a scan over every pattern.
+        """
+        host = domain.lower().rsplit('@', 1)[-1].split(':', 1)[0]
+        while host:
+            if host in _NEWS_SELECTORS and host != 'generic':
+                return host
+            host = host.partition('.')[2]
         
-        return selectors['generic']
\ No newline at end of file
+        return 'generic'
+    
+    # The getters below copy the shared tables, so callers may modify the result
+    
+    @staticmethod
+    def get_selectors_for_domain(domain: str) -> Dict[str, List[str]]:
+        """Get appropriate selectors for a specific domain"""
+        selectors = _NEWS_SELECTORS[SelectorIntelligence._match_pattern(domain)]
+        return {field: list(field_selectors) for field, field_selectors in selectors.items()}
+    
+    @staticmethod
+    def get_selector_chains_for_domain(domain: str) -> Dict[str, str]:
+        """Get comma-joined CSS fallback chains for a specific domain"""
+        return dict(_SELECTOR_CHAINS[SelectorIntelligence._match_pattern(domain)])
+    
+    @staticmethod
+    def get_selector_xpaths_for_domain(domain: str) -> Dict[str, etree.XPath]:
+        """Get precompiled XPath expressions for a specific domain's fallback chains"""
+        return dict(_SELECTOR_XPATHS[SelectorIntelligence._match_pattern(domain)])
@@ -3,8 +3,28 @@ Anti-scraping detection and countermeasures
 """
 
 import asyncio
+import logging
 import random
-from typing import Dict
+from collections import Counter
+from typing import Dict, Tuple, Union
+
+from ..core.config import Config
+
+
+# Page text indicators for each anti-scraping measure
+_MEASURE_INDICATORS: Dict[str, Tuple[str, ...]] = {
+    'cloudflare': ('cloudflare', 'cf-ray', 'checking your browser'),
+    'captcha': ('captcha', 'recaptcha', 'hcaptcha', 'prove you are human'),
+    'javascript_challenge': ('please enable javascript', 'javascript is required', 'js-disabled'),
+    'bot_detection': ('bot detected', 'automated traffic', 'suspicious activity'),
+    'geo_blocking': ('not available in your country', 'geo-restricted', 'location restricted')
+}
+
+# Byte-string copies for detecting on raw response bodies without decoding
+_MEASURE_INDICATORS_BYTES: Dict[str, Tuple[bytes, ...]] = {
+    name: tuple(indicator.encode() for indicator in indicators)
+    for name, indicators in _MEASURE_INDICATORS.items()
+}
 
 
 class AntiScrapingHandler:
@@ -12,73 +32,59 @@ class AntiScrapingHandler:
     Understanding and handling of anti-scraping mechanisms
     """
     
+    # Failure backoff multipliers, 1.5 ** n; beyond the table the 30s cap applies anyway
+    _BACKOFF: Tuple[float, ...] = tuple(1.5 ** n for n in range(16))
+    
     def __init__(self):
         self.request_delays = {}
-        self.failure_counts = {}
-        self.last_request_times = {}
+        self.failure_counts: Counter = Counter()
+        self.logger = logging.getLogger(__name__)
     
     def calculate_smart_delay(self, domain: str) -> float:
         """Calculate intelligent delay based on domain and previous failures"""
-        base_delay = 1.0
-        
-        # Domain-specific base delays
-        domain_delays = {
-            'bbc.com': 2.0,
-            'cnn.com': 1.5,
-            'reuters.com': 2.0,
-            'nytimes.com': 3.0,
-            'wsj.com': 4.0
-        }
-        
-        base_delay = domain_delays.get(domain, base_delay)
+        base_delay = Config.DOMAIN_DELAYS.get(domain, Config.BASE_DELAY)
         
         # Increase delay based on previous failures
-        failure_count = self.failure_counts.get(domain, 0)
+        failure_count = self.failure_counts[domain]
         if failure_count > 0:
-            base_delay *= (1.5 ** failure_count)
+            base_delay *= self._BACKOFF[min(failure_count, len(self._BACKOFF) - 1)]
         
-        # Add random jitter to avoid detection
-        jitter = random.uniform(0.5, 1.5)
+        # Add random jitter (0.5x - 1.5x) to avoid detection
+        jitter = random.random() + 0.5
         
         return min(base_delay * jitter, 30.0)  # Cap at 30 seconds
     
     async def handle_rate_limiting(self, domain: str, status_code: int):
         """Handle rate limiting responses intelligently"""
         if status_code == 429:  # Too Many Requests
-            self.failure_counts[domain] = self.failure_counts.get(domain, 0) + 1
+            self.failure_counts[domain] += 1
             delay = self.calculate_smart_delay(domain)
             
-            print(f"⏳ Rate limited on {domain}. Waiting {delay:.1f} seconds...")
+            self.logger.warning(f"Rate limited on {domain}. Waiting {delay:.1f} seconds...")
             await asyncio.sleep(delay)
             
         elif status_code == 403:  # Forbidden
-            self.failure_counts[domain] = self.failure_counts.get(domain, 0) + 1
-            print(f"🚫 Access forbidden on {domain}. Increasing delay...")
+            self.failure_counts[domain] += 1
+            self.logger.warning(f"Access forbidden on {domain}. Increasing delay...")
             
         elif status_code == 503:  # Service Unavailable
-            delay = random.uniform(30, 60)
-            print(f"🔧 Service unavailable on {domain}. Waiting {delay:.1f} seconds...")
+            delay = 30.0 + 30.0 * random.random()
+            self.logger.warning(f"Service unavailable on {domain}. Waiting {delay:.1f} seconds...")
             await asyncio.sleep(delay)
     
-    def detect_anti_scraping_measures(self, html_content: str, headers: Dict) -> Dict[str, bool]:
-        """Detect various anti-scraping measures"""
+    def detect_anti_scraping_measures(self, html_content: Union[str, bytes], headers: Dict) -> Dict[str, bool]:
+        """Detect various anti-scraping measures (accepts decoded or raw HTML)"""
+        if isinstance(html_content, bytes):
+            indicator_table = _MEASURE_INDICATORS_BYTES
+        else:
+            indicator_table = _MEASURE_INDICATORS
+        
+        # One lowercase copy; each indicator check is then a C-level substring search
+        content_lower = html_content.lower()
         measures = {
-            'cloudflare': any(indicator in html_content.lower() for indicator in [
-                'cloudflare', 'cf-ray', 'checking your browser'
-            ]),
-            'captcha': any(indicator in html_content.lower() for indicator in [
-                'captcha', 'recaptcha', 'hcaptcha', 'prove you are human'
-            ]),
-            'javascript_challenge': any(indicator in html_content.lower() for indicator in [
-                'please enable javascript', 'javascript is required', 'js-disabled'
-            ]),
-            'bot_detection': any(indicator in html_content.lower() for indicator in [
-                'bot detected', 'automated traffic', 'suspicious activity'
-            ]),
-            'rate_limiting': 'retry-after' in headers or 'x-ratelimit' in str(headers).lower(),
-            'geo_blocking': any(indicator in html_content.lower() for indicator in [
-                'not available in your country', 'geo-restricted', 'location restricted'
-            ])
+            name: any(indicator in content_lower for indicator in indicators)
+            for name, indicators in indicator_table.items()
         }
+        measures['rate_limiting'] = 'retry-after' in headers or 'x-ratelimit' in str(headers).lower()
         
-        return measures
\ No newline at end of file
+        return measures
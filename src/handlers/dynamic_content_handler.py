@@ -2,42 +2,30 @@
 JavaScript and dynamic content processing handler
 """
 
-from typing import Dict, List
-from urllib.parse import urlparse
+from functools import lru_cache
+from typing import Dict, Tuple, Union
 
+from ..utils.urls import get_netloc
 
-class DynamicContentHandler:
-    """
-    JavaScript handling and dynamic content processing
-    """
-    
-    @staticmethod
-    def detect_spa_framework(html_content: str) -> Dict[str, bool]:
-        """Detect if the page uses SPA frameworks"""
-        frameworks = {
-            'react': any(pattern in html_content.lower() for pattern in [
-                'react', '_react', 'reactdom', 'jsx'
-            ]),
-            'vue': any(pattern in html_content.lower() for pattern in [
-                'vue.js', 'vuejs', 'vue-', '__vue__'
-            ]),
-            'angular': any(pattern in html_content.lower() for pattern in [
-                'angular', 'ng-', 'angularjs'
-            ]),
-            'nextjs': 'next.js' in html_content.lower() or '__next' in html_content.lower(),
-            'nuxt': 'nuxt' in html_content.lower(),
-            'svelte': 'svelte' in html_content.lower()
-        }
-        
-        return frameworks
-    
-    @staticmethod
-    def generate_smart_js_code(url: str, framework_info: Dict[str, bool]) -> List[str]:
-        """Generate intelligent JavaScript based on detected frameworks"""
-        js_code = []
-        
-        # Universal scroll behavior for lazy loading
-        js_code.append("""
+
+# Substring signatures identifying each SPA framework
+_FRAMEWORK_SIGNATURES: Dict[str, Tuple[str, ...]] = {
+    'react': ('react', '_react', 'reactdom', 'jsx'),
+    'vue': ('vue.js', 'vuejs', 'vue-', '__vue__'),
+    'angular': ('angular', 'ng-', 'angularjs'),
+    'nextjs': ('next.js', '__next'),
+    'nuxt': ('nuxt',),
+    'svelte': ('svelte',)
+}
+
+# Byte-string copies for detecting on raw response bodies without decoding
+_FRAMEWORK_SIGNATURES_BYTES: Dict[str, Tuple[bytes, ...]] = {
+    name: tuple(signature.encode() for signature in signatures)
+    for name, signatures in _FRAMEWORK_SIGNATURES.items()
+}
+
+# Scroll to the bottom repeatedly so lazy-loaded content renders
+_LAZY_SCROLL_JS = """
         // Intelligent scrolling for lazy-loaded content
         (async () => {
             const initialHeight = document.body.scrollHeight;
@@ -58,11 +46,10 @@ class DynamicContentHandler:
             // Scroll back to top
             window.scrollTo(0, 0);
         })();
-        """)
-        
-        # Framework-specific handling
-        if framework_info.get('react') or framework_info.get('nextjs'):
-            js_code.append("""
+        """
+
+# Wait for React components to render
+_REACT_WAIT_JS = """
             // Wait for React components to fully render
             (async () => {
                 let attempts = 0;
@@ -75,10 +62,10 @@ class DynamicContentHandler:
                     attempts++;
                 }
             })();
-            """)
-        
-        if framework_info.get('vue') or framework_info.get('nuxt'):
-            js_code.append("""
+            """
+
+# Wait for Vue.js hydration
+_VUE_WAIT_JS = """
             // Wait for Vue.js hydration
             (async () => {
                 let attempts = 0;
@@ -90,11 +77,10 @@ class DynamicContentHandler:
                     attempts++;
                 }
             })();
-            """)
-        
-        # Handle infinite scroll and "Load More" buttons
-        if 'news' in url or 'blog' in url:
-            js_code.append("""
+            """
+
+# Click visible "Load More" buttons on news and blog listings
+_LOAD_MORE_JS = """
             // Handle "Load More" buttons and infinite scroll
             (async () => {
                 const loadMoreSelectors = [
@@ -115,25 +101,101 @@ class DynamicContentHandler:
                     }
                 }
             })();
-            """)
+            """
+
+# Per-site readiness checks, matched against the domain in order
+_WAIT_CONDITIONS: Dict[str, str] = {
+    'bbc': "() => document.querySelector('[data-testid=\"headline\"]') !== null",
+    'cnn': "() => document.querySelector('.headline__text') !== null",
+    'reuters': "() => document.querySelector('[data-testid=\"Heading\"]') !== null"
+}
+
+# Generic condition for article pages
+_DEFAULT_WAIT_CONDITION = """() => {
+                const title = document.querySelector('h1');
+                const content = document.querySelectorAll('p');
+                return title && content.length > 3;
+            }"""
+
+
+@lru_cache(maxsize=1024)
+def _wait_condition_for(domain: str) -> str:
+    """Pick the wait condition for a domain (memoized per domain)"""
+    domain = domain.lower()
+    for key, condition in _WAIT_CONDITIONS.items():
+        if key in domain:
+            return condition
+    
+    return _DEFAULT_WAIT_CONDITION
+
+
+def _js_features(url: str, framework_info: Dict[str, bool]) -> Tuple[bool, bool, bool]:
+    """(React-like, Vue-like, listing page) flags that select the JavaScript blocks"""
+    return (
+        bool(framework_info.get('react') or framework_info.get('nextjs')),
+        bool(framework_info.get('vue') or framework_info.get('nuxt')),
+        'news' in url or 'blog' in url
+    )
+
+
+@lru_cache(maxsize=8)
+def _js_blocks(react: bool, vue: bool, load_more: bool) -> Tuple[str, ...]:
+    """JavaScript blocks for one combination of page features"""
+    # Universal scroll behavior for lazy loading
+    blocks = [_LAZY_SCROLL_JS]
+    
+    # Framework-specific handling
+    if react:
+        blocks.append(_REACT_WAIT_JS)
+    if vue:
+        blocks.append(_VUE_WAIT_JS)
+    
+    # Handle infinite scroll and "Load More" buttons
+    if load_more:
+        blocks.append(_LOAD_MORE_JS)
+    
+    return tuple(blocks)
+
+
+@lru_cache(maxsize=8)
+def _js_script(react: bool, vue: bool, load_more: bool) -> str:
+    """The blocks joined into one script, evaluated in a single browser round-trip"""
+    return '\n'.join(_js_blocks(react, vue, load_more))
+
+
+class DynamicContentHandler:
+    """
+    JavaScript handling and dynamic content processing
+    """
+    
+    @staticmethod
+    def detect_spa_framework(html_content: Union[str, bytes]) -> Dict[str, bool]:
+        """Detect if the page uses SPA frameworks (accepts decoded or raw HTML)"""
+        if isinstance(html_content, bytes):
+            signature_table = _FRAMEWORK_SIGNATURES_BYTES
+        else:
+            signature_table = _FRAMEWORK_SIGNATURES
+        
+        # One lowercase copy; each signature check is then a C-level substring search
+        content_lower = html_content.lower()
+        frameworks = {
+            name: any(signature in content_lower for signature in signatures)
+            for name, signatures in signature_table.items()
+        }
         
-        return js_code
+        return frameworks
+    
+    @staticmethod
+    def generate_smart_js_blocks(url: str, framework_info: Dict[str, bool]) -> Tuple[str, ...]:
+        """Generate the individual JavaScript blocks for the detected frameworks"""
+        return _js_blocks(*_js_features(url, framework_info))
+    
+    @staticmethod
+    def generate_smart_js_code(url: str, framework_info: Dict[str, bool]) -> str:
+        """Generate intelligent JavaScript based on detected frameworks, as one script"""
+        return _js_script(*_js_features(url, framework_info))
     
     @staticmethod
     def create_wait_conditions(url: str) -> str:
         """Create intelligent wait conditions based on URL patterns"""
-        domain = urlparse(url).netloc
-        
-        if 'bbc' in domain:
-            return "() => document.querySelector('[data-testid=\"headline\"]') !== null"
-        elif 'cnn' in domain:
-            return "() => document.querySelector('.headline__text') !== null"
-        elif 'reuters' in domain:
-            return "() => document.querySelector('[data-testid=\"Heading\"]') !== null"
-        else:
-            # Generic condition for article pages
-            return """() => {
-                const title = document.querySelector('h1');
-                const content = document.querySelectorAll('p');
-                return title && content.length > 3;
-            }"""
\ No newline at end of file
+        return _wait_condition_for(get_netloc(url))
@@ -6,7 +6,54 @@ import asyncio
 import random
 import aiohttp
 import logging
-from typing import Any, Callable
+import math
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache, wraps
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+from ..utils.urls import get_netloc
+
+
+# HTTP statuses worth retrying (rate limiting and transient server errors)
+RETRYABLE_STATUSES = frozenset({429, 502, 503, 504})
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)"""
+    if not value:
+        return None
+    
+    try:
+        seconds = float(value)
+    except ValueError:
+        pass
+    else:
+        return max(seconds, 0.0) if math.isfinite(seconds) else None
+    
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+@lru_cache(maxsize=32)
+def _backoff_schedule(base_delay: float, backoff_factor: float, max_delay: float,
+                      retries: int) -> Tuple[float, ...]:
+    """Capped exponential delay before each retry, computed once per setting"""
+    return tuple(min(base_delay * backoff_factor ** attempt, max_delay) for attempt in range(retries))
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an operation whose host keeps failing"""
 
 
 class ErrorHandler:
@@ -14,16 +61,102 @@ class ErrorHandler:
     Comprehensive error handling and retry mechanisms
     """
     
+    # Module-level set, shared with the example systems' crawl retries
+    RETRYABLE_STATUSES = RETRYABLE_STATUSES
+    
     def __init__(self):
         self.max_retries = 3
         self.base_delay = 1.0
         self.max_delay = 60.0
         self.backoff_factor = 2.0
         self.logger = logging.getLogger(__name__)
+        # Private generator: jitter draws skip the shared module-level instance
+        self._rng = random.Random()
+        
+        # Circuit breaker: key -> (consecutive failed calls, open until monotonic time),
+        # in LRU order and bounded; keys whose half-open trial call is in flight
+        self.circuit_threshold = 5
+        self.circuit_cooldown = 30.0
+        self.circuit_max_cooldown = 600.0
+        self.circuit_cache_size = 1024
+        self._failures: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._half_open: Set[str] = set()
     
-    async def execute_with_retry(self, operation: Callable, *args, **kwargs) -> Any:
-        """Execute operation with intelligent retry logic"""
+    async def execute_with_retry(self, operation: Callable, *args,
+                                 circuit_key: Optional[str] = None, **kwargs) -> Any:
+        """Execute operation with intelligent retry logic
+        
+        Calls are grouped by `circuit_key`, defaulting to the host of the first
+        URL argument. Once a host has failed `circuit_threshold` calls in a row,
+        further calls fail fast with CircuitOpenError until its cooldown ends;
+        then a single trial call goes through while the others keep failing fast.
+        """
+        key = circuit_key or self._circuit_key(args)
+        if key is None:
+            return await self._retry_loop(operation, args, kwargs)
+        
+        trial = self._check_circuit(key)
+        try:
+            result = await self._retry_loop(operation, args, kwargs)
+        except Exception:
+            self._record_failure(key)
+            raise
+        finally:
+            if trial:
+                self._half_open.discard(key)
+        
+        # A success closes the circuit and forgets the key
+        self._failures.pop(key, None)
+        return result
+    
+    @staticmethod
+    def _circuit_key(args: Tuple) -> Optional[str]:
+        """Host of the first URL among the operation's positional arguments"""
+        for arg in args:
+            if isinstance(arg, str) and '://' in arg:
+                return get_netloc(arg)
+        return None
+    
+    def _check_circuit(self, key: str) -> bool:
+        """Raise CircuitOpenError while the key's circuit is open
+        
+        Returns True when the caller is the half-open trial call, which must
+        release its slot once it finishes.
+        """
+        entry = self._failures.get(key)
+        if entry is None or entry[0] < self.circuit_threshold:
+            return False
+        
+        remaining = entry[1] - time.monotonic()
+        if remaining > 0:
+            raise CircuitOpenError(f"Circuit open for {key}; retry in {remaining:.1f}s")
+        if key in self._half_open:
+            raise CircuitOpenError(f"Circuit half-open for {key}; trial call in progress")
+        
+        self._half_open.add(key)
+        return True
+    
+    def _record_failure(self, key: str):
+        """Count a failed call and (re)open the circuit once past the threshold"""
+        count = self._failures.get(key, (0, 0.0))[0] + 1
+        open_until = 0.0
+        if count >= self.circuit_threshold:
+            # Each failed trial call after opening doubles the cooldown
+            cooldown = min(self.circuit_cooldown * 2 ** (count - self.circuit_threshold),
+                           self.circuit_max_cooldown)
+            open_until = time.monotonic() + cooldown
+            self.logger.warning("Circuit open for %s after %d failures; cooling down %.0fs",
+                                key, count, cooldown)
+        self._failures[key] = (count, open_until)
+        self._failures.move_to_end(key)
+        if len(self._failures) > self.circuit_cache_size:
+            self._failures.popitem(last=False)
+    
+    async def _retry_loop(self, operation: Callable, args: Tuple, kwargs: Dict[str, Any]) -> Any:
+        """Call operation until it succeeds or a non-retryable error occurs"""
         last_exception = None
+        server_delay = self.base_delay
+        schedule = _backoff_schedule(self.base_delay, self.backoff_factor, self.max_delay, self.max_retries)
         
         for attempt in range(self.max_retries + 1):
             try:
@@ -32,18 +165,26 @@ class ErrorHandler:
             except asyncio.TimeoutError as e:
                 last_exception = e
                 if attempt < self.max_retries:
-                    delay = min(self.base_delay * (self.backoff_factor ** attempt), self.max_delay)
-                    jitter = random.uniform(0.8, 1.2)
-                    await asyncio.sleep(delay * jitter)
-                    self.logger.warning(f"Timeout retry {attempt + 1}/{self.max_retries}")
+                    # Full jitter: uniform over [0, capped exponential delay]
+                    delay = self._rng.random() * schedule[attempt]
+                    self.logger.warning("Timeout retry %d/%d in %.1fs", attempt + 1, self.max_retries, delay)
+                    await asyncio.sleep(delay)
                 
             except aiohttp.ClientError as e:
                 last_exception = e
-                if "429" in str(e) or "503" in str(e):  # Rate limiting or service unavailable
+                if getattr(e, 'status', None) in self.RETRYABLE_STATUSES:
                     if attempt < self.max_retries:
-                        delay = min(30 * (attempt + 1), 120)  # Longer delays for server issues
-                        await asyncio.sleep(delay)
-                        self.logger.warning(f"Server error retry {attempt + 1}/{self.max_retries}")
+                        # Honor the server's Retry-After, else use decorrelated jitter
+                        headers = getattr(e, 'headers', None) or {}
+                        delay = parse_retry_after(headers.get('Retry-After'))
+                        if delay is None:
+                            delay = self._rng.uniform(self.base_delay, server_delay * 3)
+                        server_delay = min(delay, self.max_delay)
+                        
+                        self.logger.warning(
+                            "Server error retry %d/%d in %.1fs", attempt + 1, self.max_retries, server_delay
+                        )
+                        await asyncio.sleep(server_delay)
                     else:
                         break
                 else:
@@ -51,10 +192,21 @@ class ErrorHandler:
                 
             except Exception as e:
                 last_exception = e
-                self.logger.error(f"Unexpected error: {e}")
+                self.logger.error("Unexpected error: %s", e)
                 break  # Don't retry unexpected errors
         
         raise last_exception
+    
+    def with_retry(self, operation: Callable) -> Callable:
+        """Decorate a coroutine function so every call goes through execute_with_retry
+        
+        A circuit_key keyword given to the wrapper goes to execute_with_retry.
+        """
+        @wraps(operation)
+        async def wrapper(*args, **kwargs):
+            return await self.execute_with_retry(operation, *args, **kwargs)
+        
+        return wrapper
 
 
 # Create alias for backward compatibility
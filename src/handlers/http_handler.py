@@ -3,9 +3,80 @@ Advanced HTTP protocol handling and management
 """
 
 import aiohttp
+import asyncio
+import importlib.util
+import itertools
 import time
-from typing import Dict, Any
-from urllib.parse import urlparse
+from collections import OrderedDict
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, Iterable, List, Mapping, Optional, Tuple
+
+from ..core.config import Config
+from ..utils.urls import get_netloc
+
+
+# aiohttp can only decode Brotli bodies when a brotli binding is installed
+_HAS_BROTLI = any(
+    importlib.util.find_spec(module) is not None for module in ('brotli', 'brotlicffi')
+)
+ACCEPT_ENCODING = 'br, gzip, deflate' if _HAS_BROTLI else 'gzip, deflate'
+
+try:
+    import httpx
+except ImportError:  # httpx is optional; probes and fetches fall back to aiohttp
+    httpx = None
+
+# Probes and fetches multiplex over one HTTP/2 connection per host when h2 is available
+_HAS_HTTP2 = httpx is not None and importlib.util.find_spec('h2') is not None
+
+# Transport headers Chromium negotiates itself: it decodes br natively and
+# speaks HTTP/2, where connection-specific headers are not allowed
+BROWSER_MANAGED_HEADERS = frozenset({'Accept-Encoding', 'Connection'})
+
+# Headers shared by every request; User-Agent and Referer are filled per call
+_BASE_HEADERS: Mapping[str, str] = MappingProxyType({
+    'User-Agent': '',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': ACCEPT_ENCODING,
+    'DNT': '1',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+    'Sec-Fetch-Dest': 'document',
+    'Sec-Fetch-Mode': 'navigate',
+    'Sec-Fetch-Site': 'none',
+    'Sec-Fetch-User': '?1',
+    'Cache-Control': 'max-age=0'
+})
+
+# Accept-Language overrides, matched as substrings of the domain in order
+_ACCEPT_LANGUAGES = (
+    ('bbc', 'en-GB,en;q=0.9'),
+    ('cnn', 'en-US,en;q=0.9'),
+)
+
+# Response headers that advertise rate limiting (looked up case-insensitively)
+_RATE_LIMIT_HEADERS = (
+    'X-RateLimit-Limit',
+    'X-RateLimit-Remaining',
+    'X-Rate-Limit-Limit',
+    'X-Rate-Limit-Remaining',
+    'RateLimit-Limit',
+    'RateLimit-Remaining',
+    'RateLimit-Policy',
+    'Retry-After',
+)
+
+
+@lru_cache(maxsize=2048)
+def _accept_language_for(domain: str) -> Optional[str]:
+    """Accept-Language override for a domain, or None to keep the default"""
+    domain = domain.lower()
+    for keyword, accept_language in _ACCEPT_LANGUAGES:
+        if keyword in domain:
+            return accept_language
+    return None
 
 
 class SmartHTTPHandler:
@@ -14,36 +85,34 @@ class SmartHTTPHandler:
     """
     
     def __init__(self):
-        self.session = None
+        # One pooled session per handler, created lazily inside the event loop
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Health probes and fetches use HTTP/2 when httpx and h2 are installed
+        self.h2_client: Optional["httpx.AsyncClient"] = None
+        self._h2_loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # Recent health probes by URL: url -> (expiry, result), in LRU order
+        self.health_cache_ttl = 30.0
+        self.health_cache_error_ttl = 5.0
+        self.health_cache_size = 1024
+        self._health_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
         self.user_agents = [
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
             "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
             "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
         ]
-        self.current_ua_index = 0
+        self._ua_cycle = itertools.cycle(self.user_agents)
     
     def get_smart_headers(self, url: str, referer: str = None) -> Dict[str, str]:
         """Generate intelligent headers based on target URL"""
-        domain = urlparse(url).netloc
+        domain = get_netloc(url)
         
         # Rotate User-Agent
-        ua = self.user_agents[self.current_ua_index % len(self.user_agents)]
-        self.current_ua_index += 1
-        
-        headers = {
-            'User-Agent': ua,
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'none',
-            'Sec-Fetch-User': '?1',
-            'Cache-Control': 'max-age=0'
-        }
+        ua = next(self._ua_cycle)
+        
+        headers = dict(_BASE_HEADERS)
+        headers['User-Agent'] = ua
         
         # Add appropriate referer
         if referer:
@@ -52,34 +121,149 @@ class SmartHTTPHandler:
             headers['Referer'] = 'https://www.google.com/'
         
         # Domain-specific customizations
-        if 'bbc' in domain:
-            headers['Accept-Language'] = 'en-GB,en;q=0.9'
-        elif 'cnn' in domain:
-            headers['Accept-Language'] = 'en-US,en;q=0.9'
+        accept_language = _accept_language_for(domain)
+        if accept_language is not None:
+            headers['Accept-Language'] = accept_language
         
         return headers
     
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it on first use in the running loop"""
+        loop = asyncio.get_running_loop()
+        if self.session is None or self.session.closed or self._session_loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=10,
+                ttl_dns_cache=Config.DNS_CACHE_TTL,
+                keepalive_timeout=75,
+                enable_cleanup_closed=True
+            )
+            self.session = aiohttp.ClientSession(connector=connector, auto_decompress=True)
+            self._session_loop = loop
+        
+        return self.session
+    
+    async def _ensure_h2_client(self) -> "httpx.AsyncClient":
+        """Return the shared HTTP/2 client, creating it on first use in the running loop"""
+        loop = asyncio.get_running_loop()
+        if self.h2_client is None or self.h2_client.is_closed or self._h2_loop is not loop:
+            self.h2_client = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+                timeout=10.0
+            )
+            self._h2_loop = loop
+        
+        return self.h2_client
+    
+    async def close(self):
+        """Close the shared clients and their pooled connections"""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+        
+        if self.h2_client is not None and not self.h2_client.is_closed:
+            await self.h2_client.aclose()
+        self.h2_client = None
+    
+    async def fetch(self, url: str, headers: Dict[str, str]) -> Tuple[int, Mapping[str, str], bytes]:
+        """GET a URL on a pooled client; returns (status, case-insensitive headers, body)
+
+        Uses the HTTP/2 client when h2 is available, so requests to one host
+        (or a shared CDN front) multiplex over a single connection.
+        """
+        if _HAS_HTTP2:
+            client = await self._ensure_h2_client()
+            # httpx negotiates encoding and connection reuse itself, and
+            # HTTP/2 rejects connection-specific headers
+            response = await client.get(
+                url, headers=self.browser_headers(headers), follow_redirects=True
+            )
+            return response.status_code, response.headers, response.content
+        
+        session = await self._ensure_session()
+        async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=10)) as response:
+            return response.status, response.headers, await response.read()
+    
+    @staticmethod
+    def browser_headers(headers: Dict[str, str]) -> Dict[str, str]:
+        """Strip transport headers from smart headers before handing them to the browser"""
+        return {name: value for name, value in headers.items() if name not in BROWSER_MANAGED_HEADERS}
+    
     async def check_url_health(self, url: str) -> Dict[str, Any]:
-        """Check URL accessibility and response characteristics"""
+        """Check URL accessibility and response characteristics
+        
+        Results are cached per URL for health_cache_ttl seconds (failures for
+        health_cache_error_ttl), so bursts of probes hit the network once.
+        """
+        now = time.monotonic()
+        cached = self._health_cache.get(url)
+        if cached is not None and cached[0] > now:
+            self._health_cache.move_to_end(url)
+            return dict(cached[1])
+        
+        result = await self._probe_url_health(url)
+        
+        ttl = self.health_cache_ttl if result['accessible'] else self.health_cache_error_ttl
+        self._health_cache[url] = (time.monotonic() + ttl, result)
+        self._health_cache.move_to_end(url)
+        if len(self._health_cache) > self.health_cache_size:
+            self._health_cache.popitem(last=False)
+        
+        return dict(result)
+    
+    async def check_urls_health(self, urls: Iterable[str], concurrency: int = 32) -> List[Any]:
+        """Check many URLs concurrently over the shared session
+        
+        At most `concurrency` probes are in flight. Results come back in input
+        order; an unexpected exception is returned in place of its result.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def check(url: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.check_url_health(url)
+        
+        return await asyncio.gather(*(check(url) for url in urls), return_exceptions=True)
+    
+    async def _probe_url_health(self, url: str) -> Dict[str, Any]:
+        """Send one HEAD request and summarize the response"""
         try:
-            async with aiohttp.ClientSession() as session:
+            if _HAS_HTTP2:
+                client = await self._ensure_h2_client()
                 start_time = time.time()
-                async with session.head(url, timeout=10) as response:
-                    latency = time.time() - start_time
-                    
-                    return {
-                        'accessible': True,
-                        'status_code': response.status,
-                        'latency': latency,
-                        'server': response.headers.get('Server', 'Unknown'),
-                        'content_type': response.headers.get('Content-Type', 'Unknown'),
-                        'cache_control': response.headers.get('Cache-Control', 'None'),
-                        'has_rate_limit': 'rate-limit' in str(response.headers).lower(),
-                        'redirected': len(response.history) > 0
-                    }
+                response = await client.head(url)
+                latency = time.time() - start_time
+                return self._health_summary(
+                    response.status_code, latency, response.headers, bool(response.history)
+                )
+            
+            session = await self._ensure_session()
+            start_time = time.time()
+            async with session.head(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+                latency = time.time() - start_time
+                return self._health_summary(
+                    response.status, latency, response.headers, len(response.history) > 0
+                )
         except Exception as e:
             return {
                 'accessible': False,
                 'error': str(e),
                 'error_type': type(e).__name__
-            }
\ No newline at end of file
+            }
+    
+    @staticmethod
+    def _health_summary(status: int, latency: float, headers: Mapping[str, str],
+                        redirected: bool) -> Dict[str, Any]:
+        """Health result for a response; `headers` must be case-insensitive"""
+        return {
+            'accessible': True,
+            'status_code': status,
+            'latency': latency,
+            'server': headers.get('Server', 'Unknown'),
+            'content_type': headers.get('Content-Type', 'Unknown'),
+            'content_encoding': headers.get('Content-Encoding', 'identity'),
+            'cache_control': headers.get('Cache-Control', 'None'),
+            'has_rate_limit': any(name in headers for name in _RATE_LIMIT_HEADERS),
+            'redirected': redirected
+        }
@@ -3,16 +3,16 @@ Fixed News Intelligence System - Complete Web Scraping Solution
 """
 
 import asyncio
-import aiohttp
 import json
 import logging
-import random
-import sys
 import os
+import sys
+import re
+import time
+from collections import Counter, OrderedDict, defaultdict
 from datetime import datetime
-from dataclasses import asdict
-from typing import List, Dict, Any, Optional
-from urllib.parse import urlparse
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 
 from crawl4ai import AsyncWebCrawler, CacheMode, CrawlerRunConfig
 
@@ -23,8 +23,112 @@ from ..handlers.http_handler import SmartHTTPHandler
 from ..handlers.dynamic_content_handler import DynamicContentHandler
 from ..handlers.anti_scraping_handler import AntiScrapingHandler
 from ..extractors.intelligent_extractor import IntelligentExtractor
-from ..handlers.error_handler import ErrorHandler
+from ..handlers.error_handler import ErrorHandler, parse_retry_after
+from ..utils.browser import create_crawler
 from ..utils.content_processor import ContentProcessor
+from ..utils.rate_limiter import AdaptiveConcurrencyLimiter
+from ..utils.serialization import AsyncArtifactWriter, dumps
+from ..utils.urls import get_netloc
+
+# Crawler configurations per site, keyed by the site's domain (subdomains included)
+_DOMAIN_CONFIGS: Dict[str, CrawlerRunConfig] = {
+    'bbc.com': CrawlerRunConfig(
+        cache_mode=CacheMode.ENABLED,
+        css_selector='article, .story-body, .story-content',
+        excluded_tags=['nav', 'footer', 'aside'],
+        excluded_selector='.advertisement, .related-content',
+        word_count_threshold=30,
+        exclude_external_links=True,
+        user_agent_mode='random',
+        verbose=True
+    ),
+    'cnn.com': CrawlerRunConfig(
+        cache_mode=CacheMode.ENABLED,
+        css_selector='article, .zn-body',
+        excluded_tags=['nav', 'footer', 'aside'],
+        excluded_selector='.ad, .advertisement',
+        word_count_threshold=30,
+        user_agent_mode='random',
+        verbose=True
+    ),
+    'techcrunch.com': CrawlerRunConfig(
+        cache_mode=CacheMode.ENABLED,
+        css_selector='article, .entry-content, .post-content',
+        excluded_tags=['nav', 'footer', 'aside'],
+        excluded_selector='.social-share, .advertisement',
+        word_count_threshold=25,
+        exclude_external_links=True,
+        user_agent_mode='random',
+        verbose=True
+    ),
+    'reuters.com': CrawlerRunConfig(
+        cache_mode=CacheMode.ENABLED,
+        css_selector='article, .article-body, [data-testid="paragraph"]',
+        excluded_tags=['nav', 'footer', 'aside'],
+        excluded_selector='.advertisement, .related-content',
+        word_count_threshold=30,
+        exclude_external_links=True,
+        user_agent_mode='random',
+        verbose=True
+    ),
+}
+
+# General configuration for every other site
+_DEFAULT_CONFIG = CrawlerRunConfig(
+    cache_mode=CacheMode.ENABLED,
+    word_count_threshold=Config.MIN_WORD_THRESHOLD,
+    css_selector='article, main, .content, .story-body',
+    excluded_tags=['nav', 'footer', 'aside', 'script', 'style'],
+    excluded_selector='.advertisement, .ad, .sidebar, .related-content, .social-share',
+    exclude_external_links=True,
+    exclude_social_media_links=True,
+    exclude_external_images=True,
+    user_agent_mode='random',
+    check_robots_txt=True,
+    only_text=False,
+    verbose=True
+)
+
+
+@lru_cache(maxsize=1024)
+def _config_for_domain(domain: str) -> CrawlerRunConfig:
+    """Pick the crawler configuration for a domain (memoized per domain)"""
+    # Drop any credentials and port, then try the host and each parent domain
+    host = domain.lower().rpartition('@')[2].partition(':')[0]
+    while host:
+        config = _DOMAIN_CONFIGS.get(host)
+        if config is not None:
+            return config
+        host = host.partition('.')[2]
+
+    return _DEFAULT_CONFIG
+
+
+def _validators_from(headers: Dict[str, str]) -> Tuple[Optional[str], Optional[str]]:
+    """ETag and Last-Modified from a plain header dict, whatever its key casing"""
+    lowered = {name.lower(): value for name, value in headers.items()}
+    return lowered.get('etag'), lowered.get('last-modified')
+
+
+# Adaptive pacing: assumed latency for unseen domains and bounds on the spacing
+_DEFAULT_LATENCY = 2.0
+_MIN_PACING_INTERVAL = 0.5
+_MAX_PACING_INTERVAL = 5.0
+
+# Analysis entries describing the sampled URL itself, never shared across a domain
+_PER_URL_ANALYSIS_KEYS = frozenset({
+    'headers', 'validators', 'sample_text_len', 'sample_mentions_article'
+})
+
+# Script/style bodies and tags, stripped when measuring a sample's visible text
+_SCRIPT_STYLE_RE = re.compile(rb'<(script|style)\b.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(rb'<[^>]*>')
+
+
+def _visible_text_length(html: bytes) -> int:
+    """Approximate length of the text a raw HTML page shows without JavaScript"""
+    text = _TAG_RE.sub(b' ', _SCRIPT_STYLE_RE.sub(b' ', html))
+    return len(b' '.join(text.split()))
 
 
 class NewsIntelligenceSystem:
@@ -48,6 +152,36 @@ class NewsIntelligenceSystem:
         # Default news sources
         self.news_sources = self.config.DEFAULT_NEWS_SOURCES
 
+        # One browser shared by every scrape, launched on first use; smart
+        # headers reach it per URL through a before_goto hook
+        self._crawler: Optional[AsyncWebCrawler] = None
+        self._crawler_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._crawler_lock: Optional[asyncio.Lock] = None
+        self._request_headers: Dict[str, Dict[str, str]] = {}
+
+        # Scrapes currently running, so duplicate URLs share one crawl
+        self._scrapes_in_flight: Dict[str, "asyncio.Future[Optional[NewsArticle]]"] = {}
+
+        # Per-domain request spacing: one lock and last-request time per domain
+        self._domain_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self._domain_last: Dict[str, float] = {}
+        # Loop time before which a domain asked not to be contacted (Retry-After)
+        self._domain_resume: Dict[str, float] = {}
+        # Smoothed crawl latency per domain (seconds), which sets the spacing above
+        self._ewma_latency: Dict[str, float] = {}
+        # Crawls in flight per domain, halved while the domain keeps throttling
+        self.domain_concurrency = AdaptiveConcurrencyLimiter(Config.MAX_CONCURRENCY_PER_DOMAIN)
+
+        # Recent pre-scraping analysis per domain: domain -> (monotonic time, analysis)
+        self._analysis_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        # Analyses currently running, so one domain is not sampled many times at once
+        self._analysis_in_flight: Dict[str, asyncio.Event] = {}
+
+        # Validators and article from the last crawl of each URL, in LRU order
+        # and capped at CONDITIONAL_CACHE_SIZE: url -> (ETag, Last-Modified, article)
+        self._cond_cache: "OrderedDict[str, Tuple[Optional[str], Optional[str], NewsArticle]]" = OrderedDict()
+        self._load_conditional_cache()
+
     def setup_logging(self):
         """Setup logging with proper UTF-8 handling"""
         log_format = self.config.LOG_FORMAT
@@ -73,13 +207,196 @@ class NewsIntelligenceSystem:
         self.logger = logging.getLogger(__name__)
         self.logger.info("News Intelligence System initialized")
 
+    def _load_conditional_cache(self):
+        """Read validators and articles saved by a previous run"""
+        try:
+            with open(self.config.CONDITIONAL_CACHE_FILE, 'rb') as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable conditional cache: {e}")
+            return
+
+        for url, entry in entries.items():
+            try:
+                article = NewsArticle(**entry['article'])
+            except (KeyError, TypeError):
+                continue
+            self._remember_conditional(url, entry.get('etag'), entry.get('last_modified'), article)
+
+    def _remember_conditional(self, url: str, etag: Optional[str],
+                              last_modified: Optional[str], article: NewsArticle):
+        """Store a URL's validators and article, evicting the least recently used"""
+        self._cond_cache[url] = (etag, last_modified, article)
+        self._cond_cache.move_to_end(url)
+        while len(self._cond_cache) > self.config.CONDITIONAL_CACHE_SIZE:
+            self._cond_cache.popitem(last=False)
+
+    def _save_conditional_cache(self, cache: Dict[str, Tuple[Optional[str], Optional[str], NewsArticle]]):
+        """Persist validators and articles for the next run"""
+        entries = {
+            url: {'etag': etag, 'last_modified': last_modified, 'article': article}
+            for url, (etag, last_modified, article) in cache.items()
+        }
+        directory = os.path.dirname(self.config.CONDITIONAL_CACHE_FILE)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.config.CONDITIONAL_CACHE_FILE, 'wb') as f:
+            f.write(dumps(entries))
+
+    async def _get_crawler(self) -> AsyncWebCrawler:
+        """Return the shared crawler, launching the browser on first use in this loop"""
+        loop = asyncio.get_running_loop()
+        if self._crawler_loop is not loop:
+            # A crawler cannot outlive the event loop it was started on
+            self._crawler = None
+            self._crawler_loop = loop
+            self._crawler_lock = asyncio.Lock()
+
+        async with self._crawler_lock:
+            if self._crawler is None:
+                crawler = create_crawler(verbose=self.config.DEBUG)
+                crawler.crawler_strategy.set_hook('before_goto', self._apply_request_headers)
+                await crawler.start()
+                self._crawler = crawler
+
+        return self._crawler
+
+    async def _apply_request_headers(self, page, context=None, url: str = None, **kwargs):
+        """crawl4ai hook: send the smart headers chosen for the URL being crawled"""
+        headers = self._request_headers.get(url)
+        if headers:
+            await page.set_extra_http_headers(headers)
+        return page
+
+    async def close(self):
+        """Release the browser and pooled network resources, persist the conditional cache"""
+        if self._crawler is not None and self._crawler_loop is asyncio.get_running_loop():
+            crawler, self._crawler = self._crawler, None
+            await crawler.close()
+
+        await self.http_handler.close()
+        if self._cond_cache:
+            # Serialize a snapshot off the event loop; the sidecar can be large
+            await asyncio.to_thread(self._save_conditional_cache, dict(self._cond_cache))
+
+    async def __aenter__(self):
+        await self._warm_connections()
+        return self
+
+    async def _warm_connections(self):
+        """Probe the default sources that get analyzed, concurrently, before the first batch
+
+        The HEAD requests go through the handler's pooled client, so DNS,
+        TCP and TLS setup for each host is done up front and the connections
+        stay open for the scrapes. The probe results land in the handler's
+        health cache, where the first-batch analyses pick them up.
+        """
+        await self.http_handler.check_urls_health(
+            url for url in self.news_sources if not self._is_profiled(get_netloc(url).lower())
+        )
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
     async def analyze_url_before_scraping(self, url: str) -> Dict[str, Any]:
         """Comprehensive URL analysis before scraping"""
-        self.logger.info(f"Analyzing URL: {url}")
+        domain = get_netloc(url).lower()
+
+        # Profiled sites get a fixed crawler config, so sampling them would not
+        # change how they are crawled; only revalidate a previously crawled page
+        if self._is_profiled(domain):
+            return await self._profiled_analysis(url, domain)
+
+        # Framework and anti-scraping traits are stable per site, so reuse a
+        # recent analysis of the domain. Previously crawled URLs still go to
+        # the network so they can be revalidated.
+        if url in self._cond_cache:
+            return await self._analyze_url(url, domain)
+
+        cached_analysis = self._analysis_cache.get(domain)
+        if (cached_analysis is not None
+                and time.monotonic() - cached_analysis[0] < self.config.ANALYSIS_CACHE_TTL):
+            analysis = dict(cached_analysis[1])
+            analysis['url'] = url
+            analysis['timestamp'] = datetime.now().isoformat()
+            # Fresh headers per URL keep the User-Agent rotating
+            analysis['headers'] = self.http_handler.get_smart_headers(url)
+            return analysis
+
+        # Another URL of this domain is being analyzed: wait and reuse its result
+        in_flight = self._analysis_in_flight.get(domain)
+        if in_flight is not None:
+            await in_flight.wait()
+            return await self.analyze_url_before_scraping(url)
+
+        done = self._analysis_in_flight[domain] = asyncio.Event()
+        try:
+            return await self._analyze_url(url, domain)
+        finally:
+            del self._analysis_in_flight[domain]
+            done.set()
+
+    @staticmethod
+    def _is_profiled(domain: str) -> bool:
+        """Whether a domain has its own crawler config in _DOMAIN_CONFIGS"""
+        return _config_for_domain(domain) is not _DEFAULT_CONFIG
+
+    async def _profiled_analysis(self, url: str, domain: str) -> Dict[str, Any]:
+        """Analysis for a site with its own crawler config
+
+        No health probe or content sample is taken. The only request is a
+        conditional GET, sent when the URL has stored validators.
+        """
+        headers = self.http_handler.get_smart_headers(url)
+        analysis = {
+            'url': url,
+            'domain': domain,
+            'timestamp': datetime.now().isoformat(),
+            # Not probed; a failed crawl reports an unreachable page instead
+            'health': {'accessible': True, 'probed': False},
+            'headers': headers
+        }
+
+        cached = self._cond_cache.get(url)
+        if cached is None:
+            return analysis
+
+        try:
+            status, response_headers, _ = await self.http_handler.fetch(
+                url, self._conditional_headers(headers, cached)
+            )
+        except Exception as e:
+            analysis['error'] = str(e)
+            return analysis
+
+        if status == 304:
+            analysis['not_modified'] = True
+        else:
+            analysis['validators'] = (
+                response_headers.get('ETag'), response_headers.get('Last-Modified')
+            )
+        return analysis
+
+    @staticmethod
+    def _conditional_headers(headers: Dict[str, str],
+                             cached: Tuple[Optional[str], Optional[str], NewsArticle]) -> Dict[str, str]:
+        """Request headers plus If-None-Match/If-Modified-Since from stored validators"""
+        request_headers = dict(headers)
+        if cached[0]:
+            request_headers['If-None-Match'] = cached[0]
+        if cached[1]:
+            request_headers['If-Modified-Since'] = cached[1]
+        return request_headers
+
+    async def _analyze_url(self, url: str, domain: str) -> Dict[str, Any]:
+        """Probe a URL and sample its content (uncached)"""
+        self.logger.info("Analyzing URL: %s", url)
 
         analysis = {
             'url': url,
-            'domain': urlparse(url).netloc,
+            'domain': domain,
             'timestamp': datetime.now().isoformat()
         }
 
@@ -94,44 +411,105 @@ class NewsIntelligenceSystem:
         headers = self.http_handler.get_smart_headers(url)
         analysis['headers'] = headers
 
+        # Revalidate a previously crawled page instead of downloading it again
+        request_headers = headers
+        cached = self._cond_cache.get(url)
+        if cached is not None:
+            request_headers = self._conditional_headers(headers, cached)
+
         # Quick content sample to detect frameworks
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers, timeout=10) as response:
-                    sample_content = await response.text()
+            # The handler's pooled client: HTTP/2 multiplexing, keep-alive and cached DNS
+            status, response_headers, sample_content = await self.http_handler.fetch(
+                url, request_headers
+            )
+            if status == 304:
+                analysis['not_modified'] = True
+                return analysis
+
+            analysis['validators'] = (
+                response_headers.get('ETag'), response_headers.get('Last-Modified')
+            )
+
+            # Raw bytes: detection works on ASCII signatures, no decode needed
+            # Detect SPA frameworks
+            frameworks = self.dynamic_handler.detect_spa_framework(sample_content)
+            analysis['frameworks'] = frameworks
 
-                    # Detect SPA frameworks
-                    frameworks = self.dynamic_handler.detect_spa_framework(sample_content)
-                    analysis['frameworks'] = frameworks
+            # Detect anti-scraping measures
+            measures = self.anti_scraping.detect_anti_scraping_measures(
+                sample_content, response_headers
+            )
+            analysis['anti_scraping'] = measures
 
-                    # Detect anti-scraping measures
-                    measures = self.anti_scraping.detect_anti_scraping_measures(
-                        sample_content, dict(response.headers)
-                    )
-                    analysis['anti_scraping'] = measures
+            # How much readable text this page serves without JavaScript
+            analysis['sample_text_len'] = _visible_text_length(sample_content)
+            analysis['sample_mentions_article'] = b'article' in sample_content.lower()
 
         except Exception as e:
             analysis['error'] = str(e)
+            return analysis
+
+        # Share everything except this URL's own validators and sample stats
+        shared = {key: value for key, value in analysis.items() if key not in _PER_URL_ANALYSIS_KEYS}
+        self._analysis_cache[domain] = (time.monotonic(), shared)
 
         return analysis
 
-    async def smart_scrape_article(self, url: str) -> Optional[NewsArticle]:
-        """Intelligent article scraping with retry mechanism"""
+    async def smart_scrape_article(
+        self, url: str, precomputed_analysis: Optional[Dict[str, Any]] = None
+    ) -> Optional[NewsArticle]:
+        """Intelligent article scraping with retry mechanism
+
+        Concurrent calls for the same URL share one scrape: later callers
+        await the first caller's result instead of crawling again.
+        """
+        in_flight = self._scrapes_in_flight.get(url)
+        if in_flight is not None:
+            return await asyncio.shield(in_flight)
+
+        future = self._scrapes_in_flight[url] = asyncio.get_running_loop().create_future()
+        article = None
+        try:
+            article = await self._scrape_article(url, precomputed_analysis)
+            return article
+        finally:
+            del self._scrapes_in_flight[url]
+            future.set_result(article)
+
+    async def _scrape_article(
+        self, url: str, precomputed_analysis: Optional[Dict[str, Any]] = None
+    ) -> Optional[NewsArticle]:
+        """Scrape one URL (uncoalesced)"""
         self.stats.total_requests += 1
+        # Hostnames are case-insensitive; normalize once for every per-domain table
+        domain = get_netloc(url).lower()
 
         try:
-            # Pre-scraping analysis
-            analysis = await self.analyze_url_before_scraping(url)
-            domain = analysis['domain']
+            # Pre-scraping analysis, unless the caller already ran it
+            analysis = precomputed_analysis
+            if analysis is None:
+                analysis = await self.analyze_url_before_scraping(url)
 
             if not analysis.get('health', {}).get('accessible', False):
                 raise Exception(
                     f"URL not accessible: {analysis.get('health', {}).get('error', 'Unknown error')}"
                 )
 
-            # Calculate smart delay
-            delay = self.anti_scraping.calculate_smart_delay(domain)
-            await asyncio.sleep(delay)
+            # Unchanged since the last crawl: skip the browser and extraction
+            if analysis.get('not_modified') and url in self._cond_cache:
+                self.stats.successful_requests += 1
+                self.stats.total_articles += 1
+                self.logger.info("Not modified, reusing cached article: %s", url)
+                self._cond_cache.move_to_end(url)
+                return self._cond_cache[url][2]
+
+            # A static page with almost no text and no article markup will not
+            # meet any word threshold; skip launching the browser for it
+            if self._sample_is_empty(analysis):
+                raise Exception(
+                    f"Page sample has only {analysis['sample_text_len']} characters of text"
+                )
 
             # Configure crawler based on analysis
             frameworks = analysis.get('frameworks', {})
@@ -143,29 +521,62 @@ class NewsIntelligenceSystem:
             # Create intelligent configuration based on domain
             config = self._create_domain_specific_config(domain)
 
-            # Execute scraping with retry mechanism
-            async def scrape_operation():
-                async with AsyncWebCrawler(headers=headers, verbose=True) as crawler:
-                    result = await crawler.arun(url, config=config)
+            # Execute scraping with retry mechanism on the shared crawler
+            crawler = await self._get_crawler()
+
+            loop = asyncio.get_running_loop()
 
-                    if not result.success:
-                        raise Exception(f"Crawling failed: {result.error}")
+            @self.error_handler.with_retry
+            async def scrape_operation():
+                started = loop.time()
+                result = await crawler.arun(url, config=config)
+                self._note_rate_limit(domain, getattr(result, 'response_headers', None) or {})
 
-                    return result
+                if not result.success:
+                    raise Exception(f"Crawling failed: {result.error_message}")
 
-            # Scrape with retry
-            result = await self.error_handler.execute_with_retry(scrape_operation)
+                self._record_latency(domain, loop.time() - started)
+                await self.domain_concurrency.record(domain, throttled=False)
+                return result
 
-            # Extract data using multiple strategies
-            extraction_results = await self.extractor.extract_with_multiple_strategies(url)
+            # Scrape with retry; the before_goto hook sends this URL's headers
+            self._request_headers[url] = self.http_handler.browser_headers(headers)
+            try:
+                # Hold one of the domain's crawl slots, then space requests to
+                # the domain by how fast it has been answering
+                async with self.domain_concurrency.slot(domain):
+                    await self._pace(domain, self._pacing_interval(domain))
+                    result = await scrape_operation(circuit_key=domain)
+            finally:
+                self._request_headers.pop(url, None)
+
+            # The crawl just fetched this domain, so renew its analysis from
+            # that page instead of sampling the domain again later
+            self._refresh_analysis(domain, result)
+
+            # Extract data from the page already fetched, without navigating again
+            extraction_results = await self.extractor.extract_with_multiple_strategies(
+                url, crawl_result=result
+            )
 
             # Process and combine extraction results
-            article = await self.process_extraction_results(url, result, extraction_results)
+            article = await self.process_extraction_results(
+                url, result, extraction_results, source_domain=domain
+            )
+
+            # Remember validators so the next run can send a conditional GET;
+            # if the sample failed, take them from the browser's response
+            validators = analysis.get('validators')
+            if validators is None:
+                validators = _validators_from(getattr(result, 'response_headers', None) or {})
+            etag, last_modified = validators
+            if etag or last_modified:
+                self._remember_conditional(url, etag, last_modified, article)
 
             self.stats.successful_requests += 1
             self.stats.total_articles += 1
 
-            self.logger.info(f"Successfully scraped: {article.title[:50]}...")
+            self.logger.info("Successfully scraped: %.50s...", article.title)
             return article
 
         except Exception as e:
@@ -177,82 +588,103 @@ class NewsIntelligenceSystem:
                 'error_type': type(e).__name__
             })
 
-            self.logger.error(f"Failed to scrape {url}: {e}")
+            self.logger.error("Failed to scrape %s: %s", url, e)
 
             # Handle specific error types
             if "429" in str(e) or "rate" in str(e).lower():
+                # Multiplicative backoff; later successful crawls decay it again
+                self._ewma_latency[domain] = 2 * self._ewma_latency.get(domain, _DEFAULT_LATENCY)
+                await self.domain_concurrency.record(domain, throttled=True)
                 await self.anti_scraping.handle_rate_limiting(domain, 429)
 
             return None
 
-    def _create_domain_specific_config(self, domain: str) -> CrawlerRunConfig:
-        """Create domain-specific crawler configuration"""
-        domain = domain.lower()
-
-        if 'bbc.com' in domain:
-            return CrawlerRunConfig(
-                cache_mode=CacheMode.ENABLED,
-                css_selector='article, .story-body, .story-content',
-                excluded_tags=['nav', 'footer', 'aside'],
-                excluded_selector='.advertisement, .related-content',
-                word_count_threshold=30,
-                exclude_external_links=True,
-                user_agent_mode='random',
-                verbose=True
-            )
-        elif 'cnn.com' in domain:
-            return CrawlerRunConfig(
-                cache_mode=CacheMode.ENABLED,
-                css_selector='article, .zn-body',
-                excluded_tags=['nav', 'footer', 'aside'],
-                excluded_selector='.ad, .advertisement',
-                word_count_threshold=30,
-                user_agent_mode='random',
-                verbose=True
-            )
-        elif 'techcrunch.com' in domain:
-            return CrawlerRunConfig(
-                cache_mode=CacheMode.ENABLED,
-                css_selector='article, .entry-content, .post-content',
-                excluded_tags=['nav', 'footer', 'aside'],
-                excluded_selector='.social-share, .advertisement',
-                word_count_threshold=25,
-                exclude_external_links=True,
-                user_agent_mode='random',
-                verbose=True
-            )
-        elif 'reuters.com' in domain:
-            return CrawlerRunConfig(
-                cache_mode=CacheMode.ENABLED,
-                css_selector='article, .article-body, [data-testid="paragraph"]',
-                excluded_tags=['nav', 'footer', 'aside'],
-                excluded_selector='.advertisement, .related-content',
-                word_count_threshold=30,
-                exclude_external_links=True,
-                user_agent_mode='random',
-                verbose=True
-            )
-        else:
-            # General configuration
-            return CrawlerRunConfig(
-                cache_mode=CacheMode.ENABLED,
-                word_count_threshold=self.config.MIN_WORD_THRESHOLD,
-                css_selector='article, main, .content, .story-body',
-                excluded_tags=['nav', 'footer', 'aside', 'script', 'style'],
-                excluded_selector='.advertisement, .ad, .sidebar, .related-content, .social-share',
-                exclude_external_links=True,
-                exclude_social_media_links=True,
-                exclude_external_images=True,
-                user_agent_mode='random',
-                check_robots_txt=True,
-                only_text=False,
-                verbose=True
+    def _refresh_analysis(self, domain: str, crawl_result: Any):
+        """Re-run detection on a crawled page and restart the domain's analysis TTL"""
+        cached = self._analysis_cache.get(domain)
+        html = getattr(crawl_result, 'html', None)
+        if cached is None or not html:
+            return
+
+        shared = dict(cached[1])
+        shared['frameworks'] = self.dynamic_handler.detect_spa_framework(html)
+        shared['anti_scraping'] = self.anti_scraping.detect_anti_scraping_measures(
+            html, getattr(crawl_result, 'response_headers', None) or {}
+        )
+        self._analysis_cache[domain] = (time.monotonic(), shared)
+
+    def _sample_is_empty(self, analysis: Dict[str, Any]) -> bool:
+        """Whether the sampled page is clearly not an article worth crawling"""
+        text_len = analysis.get('sample_text_len')
+        if text_len is None or text_len >= self.config.MIN_SAMPLE_TEXT_LENGTH:
+            return False
+
+        # SPA shells render their text with JavaScript, so only the browser can tell
+        if any(analysis.get('frameworks', {}).values()):
+            return False
+
+        return not analysis.get('sample_mentions_article', True)
+
+    def _record_latency(self, domain: str, latency: float):
+        """Fold one successful crawl's latency into the domain's moving average"""
+        previous = self._ewma_latency.get(domain)
+        self._ewma_latency[domain] = latency if previous is None else 0.7 * previous + 0.3 * latency
+
+    def _pacing_interval(self, domain: str) -> float:
+        """Spacing between requests to a domain, proportional to its recent latency"""
+        latency = self._ewma_latency.get(domain, _DEFAULT_LATENCY)
+        return max(_MIN_PACING_INTERVAL, min(_MAX_PACING_INTERVAL, 1.5 * latency))
+
+    def _note_rate_limit(self, domain: str, headers: Dict[str, str]):
+        """Hold back a domain's next request for as long as its response asked"""
+        lowered = {name.lower(): value for name, value in headers.items()}
+        delay = parse_retry_after(lowered.get('retry-after'))
+        if delay is None and lowered.get('x-ratelimit-remaining') == '0':
+            try:
+                reset = float(lowered.get('x-ratelimit-reset', ''))
+            except ValueError:
+                reset = None
+            if reset is not None:
+                # Sent either as seconds to wait or as an epoch timestamp
+                delay = max(reset - time.time(), 0.0) if reset > 1e9 else reset
+        if not delay:
+            return
+
+        resume = asyncio.get_running_loop().time() + delay
+        if resume > self._domain_resume.get(domain, float('-inf')):
+            self._domain_resume[domain] = resume
+
+    async def _pace(self, domain: str, min_interval: float):
+        """Wait until at least min_interval has passed since the domain's last request
+
+        Callers for one domain queue on its lock, so concurrent scrapes of a
+        host leave one at a time, min_interval apart; other hosts are unaffected.
+        A server-requested pause (see _note_rate_limit) is honored as well.
+        """
+        loop = asyncio.get_running_loop()
+        async with self._domain_locks[domain]:
+            ready_at = max(
+                self._domain_last.get(domain, float('-inf')) + min_interval,
+                self._domain_resume.get(domain, float('-inf'))
             )
+            wait = ready_at - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._domain_last[domain] = loop.time()
+
+    def _create_domain_specific_config(self, domain: str) -> CrawlerRunConfig:
+        """Return the domain-specific crawler configuration (built once at import)"""
+        return _config_for_domain(domain)
 
     async def process_extraction_results(
-        self, url: str, crawl_result: Any, extraction_results: Dict
+        self, url: str, crawl_result: Any, extraction_results: Dict,
+        source_domain: Optional[str] = None
     ) -> NewsArticle:
-        """Process and combine results from multiple extraction strategies"""
+        """Process and combine results from multiple extraction strategies
+
+        source_domain is the caller's already-computed domain of url; it is
+        derived from the URL only when omitted.
+        """
 
         # Start with basic information
         article_data = {
@@ -263,7 +695,7 @@ class NewsIntelligenceSystem:
             'publish_date': None,
             'category': None,
             'tags': [],
-            'source_domain': urlparse(url).netloc
+            'source_domain': source_domain if source_domain is not None else get_netloc(url).lower()
         }
 
         # Extract from CSS-based extraction (most reliable)
@@ -284,6 +716,14 @@ class NewsIntelligenceSystem:
             article_data['publish_date'] = css_data.get('date', '')
             article_data['category'] = css_data.get('category', '')
 
+        # Then semantic clusters, which win for domains where CSS comes up short
+        semantic_data = extraction_results.get('semantic_extraction')
+        if not article_data['content'] and isinstance(semantic_data, list):
+            article_data['content'] = '\n\n'.join(
+                str(block['content']) for block in semantic_data
+                if isinstance(block, dict) and block.get('content')
+            )
+
         # Fallback to markdown content if CSS extraction failed
         if not article_data['content'] and hasattr(crawl_result, 'markdown'):
             article_data['content'] = crawl_result.markdown
@@ -293,19 +733,9 @@ class NewsIntelligenceSystem:
             if hasattr(crawl_result, 'metadata') and crawl_result.metadata:
                 article_data['title'] = crawl_result.metadata.get('title', '')
 
-        # Enhanced content processing
-        article_data['content'] = self.content_processor.clean_and_enhance_content(
-            article_data['content']
-        )
-
-        # Extract tags from content and metadata
-        article_data['tags'] = self.content_processor.extract_tags(
-            article_data['content'], crawl_result
-        )
-
-        # Perform sentiment analysis
-        sentiment_score = self.content_processor.analyze_sentiment(
-            article_data['content']
+        # Clean the content, extract tags and score sentiment in one pass
+        article_data['content'], article_data['tags'], sentiment_score = (
+            self.content_processor.process_all(article_data['content'], crawl_result)
         )
 
         # Create NewsArticle object
@@ -323,37 +753,43 @@ class NewsIntelligenceSystem:
 
         return article
 
-    async def run_comprehensive_scraping(self, urls: List[str] = None) -> List[NewsArticle]:
-        """Run comprehensive scraping demonstration"""
+    async def run_comprehensive_scraping(
+        self, urls: List[str] = None, artifact_file: Optional[str] = None
+    ) -> List[NewsArticle]:
+        """Run comprehensive scraping demonstration
+
+        With artifact_file, each article is appended to that JSON Lines file
+        as soon as it is extracted; a background thread does the writing and
+        the file is fsynced once, when the run ends.
+        """
         if urls is None:
             urls = self.news_sources
 
-        self.logger.info(f"Starting comprehensive news scraping of {len(urls)} sources")
+        self.logger.info("Starting comprehensive news scraping of %d sources", len(urls))
         self.stats.start_time = datetime.now()
 
-        articles = []
-
-        for i, url in enumerate(urls, 1):
-            self.logger.info(f"Processing {i}/{len(urls)}: {url}")
-
-            try:
-                article = await self.smart_scrape_article(url)
-                if article:
-                    articles.append(article)
+        # Start every pre-scraping analysis now so the probes overlap with
+        # scrapes instead of each running just before its own crawl
+        analysis_semaphore = asyncio.Semaphore(self.config.ANALYSIS_CONCURRENCY)
 
-                    # Log progress
-                    self.logger.info(f"Article extracted: {article.title[:60]}...")
-                    self.logger.info(f"   Content length: {article.content_length} chars")
-                    self.logger.info(f"   Tags: {', '.join(article.tags[:3])}...")
-                    self.logger.info(f"   Sentiment: {article.sentiment_score:.2f}")
+        async def analyze(url: str) -> Dict[str, Any]:
+            async with analysis_semaphore:
+                return await self.analyze_url_before_scraping(url)
 
-                # Respectful delay between requests
-                if i < len(urls):
-                    delay = random.uniform(2, 5)
-                    await asyncio.sleep(delay)
+        analyses = [asyncio.ensure_future(analyze(url)) for url in urls]
 
-            except Exception as e:
-                self.logger.error(f"Failed to process {url}: {e}")
+        # Scrape up to SCRAPE_CONCURRENCY sources at once; results keep input order
+        semaphore = asyncio.Semaphore(self.config.SCRAPE_CONCURRENCY)
+        writer = AsyncArtifactWriter(artifact_file) if artifact_file else None
+        try:
+            results = await asyncio.gather(*(
+                self._scrape_one(semaphore, i, url, len(urls), analysis, writer)
+                for i, (url, analysis) in enumerate(zip(urls, analyses), 1)
+            ))
+        finally:
+            if writer is not None:
+                await writer.aclose()
+        articles = [article for article in results if article]
 
         self.stats.end_time = datetime.now()
 
@@ -362,6 +798,32 @@ class NewsIntelligenceSystem:
 
         return articles
 
+    async def _scrape_one(
+        self, semaphore: asyncio.Semaphore, i: int, url: str, total: int,
+        analysis: "asyncio.Future[Dict[str, Any]]",
+        writer: Optional[AsyncArtifactWriter] = None
+    ) -> Optional[NewsArticle]:
+        """Scrape one source while holding a concurrency slot, streaming it to writer"""
+        async with semaphore:
+            self.logger.info("Processing %d/%d: %s", i, total, url)
+
+            try:
+                article = await self.smart_scrape_article(url, await analysis)
+            except Exception as e:
+                self.logger.error("Failed to process %s: %s", url, e)
+                return None
+
+            # Log progress (the tag join is skipped when INFO is disabled)
+            if article and self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("Article extracted: %.60s...", article.title)
+                self.logger.info("   Content length: %d chars", article.content_length)
+                self.logger.info("   Tags: %s...", ', '.join(article.tags[:3]))
+                self.logger.info("   Sentiment: %.2f", article.sentiment_score)
+
+        if article and writer is not None:
+            await writer.submit(article)
+        return article
+
     def generate_scraping_report(self, articles: List[NewsArticle]):
         """Generate comprehensive scraping report"""
         self.logger.info("\n" + "=" * 80)
@@ -383,61 +845,54 @@ class NewsIntelligenceSystem:
 
         # Content analysis
         if articles:
-            avg_content_length = sum(article.content_length for article in articles) / len(articles)
-            avg_sentiment = sum(article.sentiment_score or 0 for article in articles) / len(articles)
+            # One pass over the articles gathers every aggregate below
+            total_length = 0
+            total_sentiment = 0.0
+            source_counts = Counter()
+            tag_counts = Counter()
+            for article in articles:
+                total_length += article.content_length
+                total_sentiment += article.sentiment_score or 0
+                source_counts[article.source_domain] += 1
+                tag_counts.update(article.tags)
+
+            avg_content_length = total_length / len(articles)
+            avg_sentiment = total_sentiment / len(articles)
 
             self.logger.info(f"Average Content Length: {avg_content_length:.0f} characters")
             self.logger.info(f"Average Sentiment Score: {avg_sentiment:.2f}")
 
             # Top sources
-            source_counts = {}
-            for article in articles:
-                source_counts[article.source_domain] = source_counts.get(article.source_domain, 0) + 1
-
             self.logger.info("\nSources Summary:")
-            for source, count in sorted(source_counts.items(), key=lambda x: x[1], reverse=True):
+            for source, count in source_counts.most_common():
                 self.logger.info(f"   {source}: {count} articles")
 
             # Top tags
-            all_tags = []
-            for article in articles:
-                all_tags.extend(article.tags)
-
-            if all_tags:
-                from collections import Counter
-                top_tags = Counter(all_tags).most_common(10)
+            if tag_counts:
                 self.logger.info("\nTop Tags:")
-                for tag, count in top_tags:
+                for tag, count in tag_counts.most_common(10):
                     self.logger.info(f"   {tag}: {count}")
 
         # Error analysis
         if self.stats.errors:
             self.logger.info(f"\nError Analysis ({len(self.stats.errors)} errors):")
-            error_types = {}
-            for error in self.stats.errors:
-                error_type = error.get('error_type', 'Unknown')
-                error_types[error_type] = error_types.get(error_type, 0) + 1
+            error_types = Counter(error.get('error_type', 'Unknown') for error in self.stats.errors)
 
-            for error_type, count in sorted(error_types.items(), key=lambda x: x[1], reverse=True):
+            for error_type, count in error_types.most_common():
                 self.logger.info(f"   {error_type}: {count}")
 
-    def save_results(self, articles: List[NewsArticle], filename: str = None) -> str:
-        """Save scraping results to JSON file"""
+    async def save_results(self, articles: List[NewsArticle], filename: str = None) -> str:
+        """Save scraping results to JSON file (serialized and written off the event loop)"""
         if filename is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"news_scraping_results_{timestamp}.json"
 
-        # Convert articles to serializable format
-        articles_data = []
-        for article in articles:
-            articles_data.append(asdict(article))
-
-        # Add metadata
+        # Dataclasses are serialized directly, without asdict() deep copies
         report_data = {
             'metadata': {
                 'scraping_timestamp': datetime.now().isoformat(),
                 'total_articles': len(articles),
-                'scraping_stats': asdict(self.stats),
+                'scraping_stats': self.stats,
                 'extraction_methods': [
                     'CSS Selector-based extraction',
                     'Intelligent JavaScript handling',
@@ -446,11 +901,15 @@ class NewsIntelligenceSystem:
                     'Content cleaning and enhancement'
                 ]
             },
-            'articles': articles_data
+            'articles': articles
         }
 
-        with open(filename, 'w', encoding=self.config.OUTPUT_ENCODING) as f:
-            json.dump(report_data, f, indent=self.config.JSON_INDENT, ensure_ascii=False, default=str)
+        await asyncio.to_thread(self._sync_save, filename, report_data)
 
         self.logger.info(f"Results saved to: {filename}")
-        return filename
\ No newline at end of file
+        return filename
+
+    def _sync_save(self, filename: str, report_data: Dict[str, Any]):
+        """Serialize the report and write it to disk (runs in a worker thread)"""
+        with open(filename, 'wb') as f:
+            f.write(dumps(report_data, indent=bool(self.config.JSON_INDENT)))
\ No newline at end of file
@@ -0,0 +1,85 @@
+"""
+Browser setup helpers for crawl4ai crawlers
+"""
+
+import asyncio
+import itertools
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+from crawl4ai import AsyncWebCrawler, BrowserConfig
+
+from ..core.config import Config
+
+_BLOCKED_RESOURCE_TYPES = frozenset(Config.BLOCKED_RESOURCE_TYPES)
+
+
+async def _route_request(route):
+    """Abort requests for resources the scrapers never read"""
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def block_heavy_resources(page, context=None, **kwargs):
+    """crawl4ai hook: install request interception on each new page
+    
+    Routing per page rather than per context keeps handlers from piling up
+    on the browser context crawl4ai reuses across crawls.
+    """
+    await page.route("**/*", _route_request)
+    return page
+
+
+def create_crawler(verbose: bool = False) -> AsyncWebCrawler:
+    """Create a crawler with lean launch flags and heavy resources blocked"""
+    browser_config = BrowserConfig(
+        headless=True,
+        extra_args=list(Config.BROWSER_EXTRA_ARGS),
+        verbose=verbose
+    )
+    
+    crawler = AsyncWebCrawler(config=browser_config)
+    crawler.crawler_strategy.set_hook('on_page_context_created', block_heavy_resources)
+    return crawler
+
+
+class PagePool:
+    """Fixed set of reusable browser pages, recycled after `max_uses` crawls
+    
+    Each page is a crawl4ai session: crawls that pass its session_id reuse
+    the same open tab instead of creating a new one, and the tab is closed
+    and replaced once it has served `max_uses` crawls to cap memory growth.
+    """
+    
+    def __init__(self, size: int = 4, max_uses: int = 50):
+        self.size = size
+        self.max_uses = max_uses
+        self._ids = itertools.count()
+        self._uses: Dict[str, int] = {}
+        self._sessions: Optional[asyncio.Queue] = None
+    
+    def _new_session_id(self) -> str:
+        return f"page-pool-{next(self._ids)}"
+    
+    @asynccontextmanager
+    async def session(self, crawler: AsyncWebCrawler):
+        """Borrow a page's session id for the duration of the block"""
+        if self._sessions is None:
+            self._sessions = asyncio.Queue()
+            for _ in range(self.size):
+                self._sessions.put_nowait(self._new_session_id())
+        
+        session_id = await self._sessions.get()
+        try:
+            yield session_id
+        finally:
+            uses = self._uses.get(session_id, 0) + 1
+            if uses >= self.max_uses:
+                self._uses.pop(session_id, None)
+                await crawler.crawler_strategy.kill_session(session_id)
+                session_id = self._new_session_id()
+            else:
+                self._uses[session_id] = uses
+            self._sessions.put_nowait(session_id)
@@ -3,10 +3,65 @@ Content processing utilities
 """
 
 import re
-from typing import List, Any
+import sys
+from typing import List, Any, Tuple
 from collections import Counter
 
 
+# Common tech/news keywords used for tag extraction
+_TECH_KEYWORDS = (
+    'artificial intelligence', 'ai', 'machine learning', 'blockchain',
+    'cryptocurrency', 'cybersecurity', 'data privacy', 'cloud computing',
+    'software', 'hardware', 'startup', 'innovation', 'digital transformation',
+    'automation', 'robotics', 'internet of things', 'iot', '5g'
+)
+
+# Keyword -> tag, titled once and interned so every article shares the same strings
+_TECH_TAGS = tuple((keyword, sys.intern(keyword.title())) for keyword in _TECH_KEYWORDS)
+
+# Keyword lists for sentiment analysis
+_POSITIVE_WORDS = (
+    'success', 'growth', 'innovation', 'breakthrough', 'advance', 'improve',
+    'excellent', 'outstanding', 'remarkable', 'positive', 'benefit', 'gain'
+)
+
+_NEGATIVE_WORDS = (
+    'failure', 'decline', 'crisis', 'problem', 'issue', 'concern',
+    'worry', 'threat', 'risk', 'danger', 'loss', 'decrease'
+)
+
+
+class _SpecialCharTable(dict):
+    """str.translate table deleting special characters but keeping basic punctuation
+
+    Keeps word characters, whitespace and .,!?;:-()"'. Entries are filled in
+    on first sight of each code point, so any character is covered.
+    """
+    
+    _KEEP = frozenset('_.,!?;:-()"\'')
+    
+    def __missing__(self, code_point: int):
+        char = chr(code_point)
+        value = code_point if char.isalnum() or char.isspace() or char in self._KEEP else None
+        self[code_point] = value
+        return value
+
+
+_SPECIAL_CHARS = _SpecialCharTable()
+
+# Trailing boilerplate removed from cleaned text (everything from the match on)
+_NOISE_RE = re.compile(
+    r'(?:Share this article|Follow us on|Subscribe to|Click here|Read more:|Related:).*',
+    re.IGNORECASE
+)
+
+# Paragraphs that are likely navigation or ads
+_SKIP_PARAGRAPH_RE = re.compile(
+    r'share this|follow us|subscribe|advertisement|related articles|more from|trending now',
+    re.IGNORECASE
+)
+
+
 class ContentProcessor:
     """Utility class for content processing and analysis"""
     
@@ -16,32 +71,24 @@ class ContentProcessor:
         if not text:
             return ""
         
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', str(text))
-        
-        # Remove special characters but keep basic punctuation
-        text = re.sub(r'[^\w\s\.\,\!\?\;\:\-\(\)\"\']+', '', text)
+        # Collapse whitespace and drop special characters without the regex engine
+        text = ' '.join(str(text).split()).translate(_SPECIAL_CHARS)
         
         # Remove common noise patterns
-        noise_patterns = [
-            r'Share this article.*',
-            r'Follow us on.*',
-            r'Subscribe to.*',
-            r'Click here.*',
-            r'Read more:.*',
-            r'Related:.*'
-        ]
-        
-        for pattern in noise_patterns:
-            text = re.sub(pattern, '', text, flags=re.IGNORECASE)
+        text = _NOISE_RE.sub('', text)
         
         return text.strip()
     
     @staticmethod
     def clean_and_enhance_content(content: str) -> str:
         """Clean and enhance article content"""
+        return '\n\n'.join(ContentProcessor._clean_paragraphs(content))
+    
+    @staticmethod
+    def _clean_paragraphs(content: str) -> List[str]:
+        """Cleaned paragraphs of article content, noise and short paragraphs dropped"""
         if not content:
-            return ""
+            return []
         
         # Split into paragraphs
         paragraphs = content.split('\n\n')
@@ -55,27 +102,16 @@ class ContentProcessor:
                 continue
             
             # Skip paragraphs that are likely navigation or ads
-            skip_patterns = [
-                r'share this',
-                r'follow us',
-                r'subscribe',
-                r'advertisement',
-                r'related articles',
-                r'more from',
-                r'trending now'
-            ]
-            
-            should_skip = any(re.search(pattern, para, re.IGNORECASE) for pattern in skip_patterns)
-            if should_skip:
+            if _SKIP_PARAGRAPH_RE.search(para):
                 continue
             
             cleaned_paragraphs.append(ContentProcessor.clean_text(para))
         
-        return '\n\n'.join(cleaned_paragraphs)
+        return cleaned_paragraphs
     
     @staticmethod
-    def extract_tags(content: str, crawl_result: Any = None) -> List[str]:
-        """Extract relevant tags from content and metadata"""
+    def _tags_from(content_lower: str, crawl_result: Any = None) -> List[str]:
+        """Tags from metadata keywords and an already-lowercased content string"""
         tags = set()
         
         # Extract from metadata keywords if available
@@ -85,46 +121,70 @@ class ContentProcessor:
                 tags.update(tag.strip() for tag in meta_keywords.split(','))
         
         # Extract key phrases from content using simple NLP
-        if content:
-            # Common tech/news keywords
-            tech_keywords = [
-                'artificial intelligence', 'ai', 'machine learning', 'blockchain',
-                'cryptocurrency', 'cybersecurity', 'data privacy', 'cloud computing',
-                'software', 'hardware', 'startup', 'innovation', 'digital transformation',
-                'automation', 'robotics', 'internet of things', 'iot', '5g'
-            ]
-            
-            content_lower = content.lower()
-            for keyword in tech_keywords:
-                if keyword in content_lower:
-                    tags.add(keyword.title())
+        if content_lower:
+            tags.update(tag for keyword, tag in _TECH_TAGS if keyword in content_lower)
         
         return list(tags)[:10]  # Limit to 10 tags
     
+    @staticmethod
+    def _sentiment_from(content_lower: str, total_words: int) -> float:
+        """Sentiment score from an already-lowercased content string and its word count"""
+        if total_words == 0:
+            return 0.0
+        
+        # Each keyword check is a C-level substring search
+        positive_score = sum(word in content_lower for word in _POSITIVE_WORDS)
+        negative_score = sum(word in content_lower for word in _NEGATIVE_WORDS)
+        
+        # Normalize to -1 to 1 scale
+        sentiment = (positive_score - negative_score) / max(total_words / 100, 1)
+        return max(-1.0, min(1.0, sentiment))
+    
+    @staticmethod
+    def extract_tags(content: str, crawl_result: Any = None) -> List[str]:
+        """Extract relevant tags from content and metadata"""
+        return ContentProcessor._tags_from(content.lower() if content else "", crawl_result)
+    
     @staticmethod
     def analyze_sentiment(content: str) -> float:
         """Simple sentiment analysis using keyword matching"""
         if not content:
             return 0.0
         
-        positive_words = [
-            'success', 'growth', 'innovation', 'breakthrough', 'advance', 'improve',
-            'excellent', 'outstanding', 'remarkable', 'positive', 'benefit', 'gain'
-        ]
-        
-        negative_words = [
-            'failure', 'decline', 'crisis', 'problem', 'issue', 'concern',
-            'worry', 'threat', 'risk', 'danger', 'loss', 'decrease'
-        ]
-        
+        return ContentProcessor._sentiment_from(content.lower(), len(content.split()))
+    
+    @staticmethod
+    def process_all(raw_content: str, crawl_result: Any = None) -> Tuple[str, List[str], float]:
+        """Clean content, then extract tags and score sentiment from one lowercase copy
+        
+        Equivalent to clean_and_enhance_content followed by extract_tags and
+        analyze_sentiment on the result, without lowercasing it twice or
+        building a word list for the whole article.
+        """
+        paragraphs = ContentProcessor._clean_paragraphs(raw_content)
+        content = '\n\n'.join(paragraphs)
         content_lower = content.lower()
-        positive_score = sum(1 for word in positive_words if word in content_lower)
-        negative_score = sum(1 for word in negative_words if word in content_lower)
         
-        total_words = len(content.split())
-        if total_words == 0:
-            return 0.0
+        # Same count as len(content.split()), one paragraph at a time
+        total_words = sum(len(para.split()) for para in paragraphs)
         
-        # Normalize to -1 to 1 scale
-        sentiment = (positive_score - negative_score) / max(total_words / 100, 1)
-        return max(-1.0, min(1.0, sentiment))
\ No newline at end of file
+        tags = ContentProcessor._tags_from(content_lower, crawl_result)
+        sentiment = ContentProcessor._sentiment_from(content_lower, total_words)
+        
+        return content, tags, sentiment
+    
+    @staticmethod
+    def extract_tags_batch(contents: List[str], crawl_results: List[Any] = None) -> List[List[str]]:
+        """Extract tags for a batch of contents in one call"""
+        if crawl_results is None:
+            crawl_results = [None] * len(contents)
+        
+        return [
+            ContentProcessor.extract_tags(content, crawl_result)
+            for content, crawl_result in zip(contents, crawl_results)
+        ]
+    
+    @staticmethod
+    def analyze_sentiment_batch(contents: List[str]) -> List[float]:
+        """Score sentiment for a batch of contents in one call"""
+        return [ContentProcessor.analyze_sentiment(content) for content in contents]
\ No newline at end of file
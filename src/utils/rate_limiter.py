@@ -0,0 +1,125 @@
+"""
+Asynchronous rate limiting utilities
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, Optional
+
+
+class TokenBucket:
+    """Token bucket allowing `rate` acquisitions per `period` seconds"""
+
+    def __init__(self, rate: float = 1, period: float = 1.0):
+        self.capacity = rate
+        self.fill_rate = rate / period
+        self._tokens = rate
+        self._updated: Optional[float] = None
+
+    async def acquire(self):
+        """Take one token, sleeping until it is available
+
+        Tokens may go negative: each caller reserves its slot immediately and
+        then sleeps off its own deficit, so waiters are served in call order
+        without a lock.
+        """
+        now = asyncio.get_running_loop().time()
+        if self._updated is not None:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.fill_rate)
+        self._updated = now
+
+        self._tokens -= 1
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.fill_rate)
+
+
+class DomainRateLimiter:
+    """Independent token buckets keyed by domain"""
+
+    def __init__(self, rate: float = 1, period: float = 3.0):
+        self.rate = rate
+        self.period = period
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def bucket(self, domain: str) -> TokenBucket:
+        """Return the bucket for a domain, creating it on first use"""
+        bucket = self._buckets.get(domain)
+        if bucket is None:
+            bucket = self._buckets[domain] = TokenBucket(self.rate, self.period)
+        return bucket
+
+    async def acquire(self, domain: str):
+        """Wait for a request slot on the given domain"""
+        await self.bucket(domain).acquire()
+
+
+class AdaptiveConcurrencyLimiter:
+    """Per-domain concurrency limits that adapt to throttling (AIMD)
+
+    Throttled responses are tracked in a rolling window per domain. Once the
+    window holds more than `threshold` of them, the domain's limit is halved;
+    after `recovery_period` seconds each successful response raises it by one
+    again, up to `max_limit`.
+    """
+
+    def __init__(self, max_limit: int = 4, window: int = 20, threshold: int = 5,
+                 recovery_period: float = 60.0):
+        self.max_limit = max_limit
+        self.window = window
+        self.threshold = threshold
+        self.recovery_period = recovery_period
+        self._limits: Dict[str, int] = {}
+        self._active: Dict[str, int] = {}
+        self._outcomes: Dict[str, Deque[int]] = {}
+        self._decreased_at: Dict[str, float] = {}
+        self._conditions: Dict[str, asyncio.Condition] = {}
+
+    def limit(self, domain: str) -> int:
+        """Current concurrency limit for a domain"""
+        return self._limits.get(domain, self.max_limit)
+
+    def _condition(self, domain: str) -> asyncio.Condition:
+        condition = self._conditions.get(domain)
+        if condition is None:
+            condition = self._conditions[domain] = asyncio.Condition()
+        return condition
+
+    @asynccontextmanager
+    async def slot(self, domain: str):
+        """Hold one of the domain's concurrency slots for the duration of the block"""
+        condition = self._condition(domain)
+        async with condition:
+            await condition.wait_for(lambda: self._active.get(domain, 0) < self.limit(domain))
+            self._active[domain] = self._active.get(domain, 0) + 1
+
+        try:
+            yield
+        finally:
+            async with condition:
+                self._active[domain] -= 1
+                condition.notify_all()
+
+    async def record(self, domain: str, throttled: bool):
+        """Feed one response outcome back into the domain's limit"""
+        outcomes = self._outcomes.get(domain)
+        if outcomes is None:
+            outcomes = self._outcomes[domain] = deque(maxlen=self.window)
+        outcomes.append(1 if throttled else 0)
+
+        limit = self.limit(domain)
+        now = time.monotonic()
+
+        if throttled and sum(outcomes) > self.threshold:
+            # Multiplicative decrease
+            self._limits[domain] = max(1, limit // 2)
+            self._decreased_at[domain] = now
+            outcomes.clear()
+        elif (not throttled and limit < self.max_limit
+              and now - self._decreased_at.get(domain, 0.0) >= self.recovery_period):
+            # Additive increase
+            self._limits[domain] = limit + 1
+            condition = self._condition(domain)
+            async with condition:
+                condition.notify_all()
@@ -0,0 +1,139 @@
+"""
+JSON serialization helpers
+"""
+
+import asyncio
+import json
+import os
+import queue
+import threading
+from dataclasses import fields, is_dataclass
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+# Large write buffer so streamed items reach disk in few syscalls
+WRITE_BUFFER_SIZE = 1 << 20
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None
+
+
+@lru_cache(maxsize=64)
+def _field_names(cls: type) -> Tuple[str, ...]:
+    """Field names of a dataclass type, computed once per class"""
+    return tuple(f.name for f in fields(cls))
+
+
+def _json_default(obj: Any) -> Any:
+    """Fallback encoder: dataclasses as dicts (like orjson), anything else as str
+
+    Dataclasses are projected shallowly; json encodes the field values and
+    calls back here for nested dataclasses, so nothing is deep-copied.
+    """
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return {name: getattr(obj, name) for name in _field_names(type(obj))}
+    return str(obj)
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize one object to UTF-8 JSON bytes (dataclasses serialize as objects)"""
+    if orjson is not None:
+        # Datetimes pass through to default=str, matching json's "YYYY-MM-DD HH:MM:SS"
+        option = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+                  | (orjson.OPT_INDENT_2 if indent else 0))
+        return orjson.dumps(obj, default=str, option=option)
+
+    text = json.dumps(obj, indent=2 if indent else None, ensure_ascii=False, default=_json_default)
+    return text.encode('utf-8')
+
+
+def write_json_stream(filename: str, header: Dict[str, Any], items_key: str, items: Iterable[Any]):
+    """Write `{**header, items_key: [...items]}` one item at a time
+
+    Only one item is serialized at any moment, so memory stays flat no matter
+    how many items the iterable yields.
+    """
+    with open(filename, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+        head = dumps(header)
+        f.write(head[:-1])
+        if header:
+            f.write(b',')
+        f.write(dumps(items_key) + b':[\n')
+
+        for index, item in enumerate(items):
+            if index:
+                f.write(b',\n')
+            f.write(dumps(item, indent=True))
+
+        f.write(b'\n]}\n')
+
+
+def write_jsonl(filename: str, items: Iterable[Any]):
+    """Write items as JSON Lines, one compact object per line"""
+    with open(filename, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+        for item in items:
+            f.write(dumps(item) + b'\n')
+
+
+class AsyncArtifactWriter:
+    """Append JSON Lines records to a file from a background thread
+    
+    Coroutines hand records over through a bounded queue, so serialization
+    and disk writes never run on the event loop. The file is fsynced once,
+    on close.
+    """
+    
+    _STOP = object()
+    
+    def __init__(self, filename: str, maxsize: int = 64):
+        self.filename = filename
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._error: Optional[BaseException] = None
+        # Opened here so a bad path fails in the caller, not the thread
+        self._file = open(filename, 'wb', buffering=WRITE_BUFFER_SIZE)
+        self._thread = threading.Thread(target=self._run, name='artifact-writer', daemon=True)
+        self._thread.start()
+    
+    def _run(self):
+        with self._file as f:
+            while True:
+                item = self._queue.get()
+                if item is self._STOP:
+                    break
+                if self._error is not None:
+                    continue  # Keep draining so producers never block
+                try:
+                    f.write(dumps(item) + b'\n')
+                except Exception as e:
+                    self._error = e
+            
+            f.flush()
+            os.fsync(f.fileno())
+    
+    async def submit(self, item: Any):
+        """Queue one record, waiting off-loop only when the queue is full"""
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            await asyncio.to_thread(self._queue.put, item)
+    
+    def close(self):
+        """Flush remaining records and wait for the writer thread"""
+        if self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join()
+        
+        if self._error is not None:
+            raise self._error
+    
+    async def aclose(self):
+        """Close without blocking the event loop"""
+        await asyncio.to_thread(self.close)
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
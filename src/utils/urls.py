@@ -0,0 +1,12 @@
+"""
+URL parsing helpers
+"""
+
+from functools import lru_cache
+from urllib.parse import urlparse
+
+
+@lru_cache(maxsize=4096)
+def get_netloc(url: str) -> str:
+    """Return the network location (domain) of a URL, memoized per URL"""
+    return urlparse(url).netloc
@@ -3,6 +3,7 @@ Unicode Fix Configuration and Environment Setup
 """
 
 import os
+import re
 import sys
 import locale
 
@@ -36,34 +37,35 @@ def setup_unicode_environment():
         sys.stderr.reconfigure(encoding='utf-8')
 
 
+# Emoji that non-UTF-8 consoles cannot encode, and their plain-text stand-ins
+_EMOJI_REPLACEMENTS = {
+    '🚀': '[ROCKET]',
+    '📰': '[NEWS]',
+    '🔍': '[SEARCH]',
+    '✅': '[SUCCESS]',
+    '❌': '[ERROR]',
+    '⏳': '[WAITING]',
+    '🚫': '[BLOCKED]',
+    '🔧': '[MAINTENANCE]',
+    '📊': '[REPORT]',
+    '⏱️': '[TIMER]',
+    '📡': '[SIGNAL]',
+    '📈': '[TRENDING]',
+    '💾': '[SAVE]',
+    '🏷️': '[TAG]',
+    '😊': '[POSITIVE]',
+    '🌐': '[GLOBAL]',
+    '🎉': '[CELEBRATION]',
+    '📝': '[DOCUMENT]'
+}
+
+# All replacements in one pattern, so a message is scanned once
+_EMOJI_RE = re.compile('|'.join(map(re.escape, _EMOJI_REPLACEMENTS)))
+
+
 def safe_log_message(message: str) -> str:
     """Convert potentially problematic Unicode characters to safe alternatives"""
-    emoji_replacements = {
-        '🚀': '[ROCKET]',
-        '📰': '[NEWS]',
-        '🔍': '[SEARCH]',
-        '✅': '[SUCCESS]',
-        '❌': '[ERROR]',
-        '⏳': '[WAITING]',
-        '🚫': '[BLOCKED]',
-        '🔧': '[MAINTENANCE]',
-        '📊': '[REPORT]',
-        '⏱️': '[TIMER]',
-        '📡': '[SIGNAL]',
-        '📈': '[TRENDING]',
-        '💾': '[SAVE]',
-        '🏷️': '[TAG]',
-        '😊': '[POSITIVE]',
-        '🌐': '[GLOBAL]',
-        '🎉': '[CELEBRATION]',
-        '📝': '[DOCUMENT]'
-    }
-
-    safe_message = message
-    for emoji, replacement in emoji_replacements.items():
-        safe_message = safe_message.replace(emoji, replacement)
-
-    return safe_message
+    return _EMOJI_RE.sub(lambda match: _EMOJI_REPLACEMENTS[match.group()], message)
 
 
 class SafeLogger:
@@ -72,6 +74,15 @@ class SafeLogger:
     def __init__(self, logger):
         self.logger = logger
 
+        # A UTF-8 console can print anything, so log straight through the
+        # logger and skip the per-call fallback wrappers below
+        encoding = (getattr(sys.stdout, 'encoding', None) or '').lower()
+        if encoding.startswith(('utf', 'cp65001')):
+            self.info = logger.info
+            self.error = logger.error
+            self.warning = logger.warning
+            self.debug = logger.debug
+
     def info(self, message):
         try:
             self.logger.info(message)